@@ -0,0 +1,51 @@
+"""
+Dashboard aggregation for the Admin API
+
+Pure, fully typed functions so the module can be compiled with mypyc.
+"""
+from collections import Counter
+from decimal import Decimal
+from operator import itemgetter
+from typing import Any, Dict, List
+
+from shared.models.base import OrderStatus, ShopStatus
+
+# Enum values as plain strings, compared against what DynamoDB returns
+PENDING_SHOP: str = ShopStatus.PENDING_APPROVAL.value
+PENDING_ORDER: str = OrderStatus.PENDING.value
+DELIVERED: str = OrderStatus.DELIVERED.value
+
+get_status = itemgetter("status")
+get_is_approved = itemgetter("is_approved")
+get_status_and_amount = itemgetter("status", "total_amount")
+
+
+def compute_stats(
+    all_users: List[Dict[str, Any]],
+    all_shops: List[Dict[str, Any]],
+    all_orders: List[Dict[str, Any]],
+    all_reviews: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Calculate dashboard statistics in a single pass per table"""
+    shop_counts = Counter(map(get_status, all_shops))
+    pending_reviews = sum(1 for approved in map(get_is_approved, all_reviews) if not approved)
+    
+    pending_orders = 0
+    # DynamoDB returns numbers as Decimal
+    total_revenue: Decimal = Decimal(0)
+    for order_status, amount in map(get_status_and_amount, all_orders):
+        if order_status == PENDING_ORDER:
+            pending_orders += 1
+        elif order_status == DELIVERED:
+            total_revenue += amount
+    
+    return {
+        "total_users": len(all_users),
+        "total_shops": len(all_shops),
+        "total_orders": len(all_orders),
+        "total_reviews": len(all_reviews),
+        "pending_shop_approvals": shop_counts[PENDING_SHOP],
+        "pending_orders": pending_orders,
+        "pending_reviews": pending_reviews,
+        "total_revenue": total_revenue
+    }
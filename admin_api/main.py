@@ -1,60 +1,170 @@
 """
 Admin API - FastAPI backend for admin app
 """
-from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Optional, Any
 from datetime import datetime
+import asyncio
 import uuid
 import logging
+import os
 
+from cachetools import TTLCache
+
+from admin_api.aggregates import compute_stats
+from shared.auth.bearer import bearer_token
 from shared.auth.google_auth import google_auth_service
-from shared.database.dynamodb import db_service
+from shared.cache.redis_cache import cache_service, APPROVED_SHOPS_PREFIX
+from shared.database.dynamodb import db_service, created_before
 from shared.models.base import (
     BaseUser, Shop, Product, Order, Review, 
     UserRole, OrderStatus, ShopStatus
 )
+from shared.utils.cors import add_cors
+from shared.utils.logging_config import configure_logging
+from shared.utils.profiling import add_profiling
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Enum value as a plain string, compared against what DynamoDB returns
+_ADMIN = UserRole.ADMIN.value
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Admin API",
     description="Backend API for Admin App",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Security
-security = HTTPBearer()
+add_cors(app)
+
+# Profile single requests with ?profile=1 when PROFILING=true
+add_profiling(app)
+
+# Logging is configured per worker on startup, not at import time
+@app.on_event("startup")
+async def startup_logging():
+    """Start the background log listener"""
+    app.state.log_listener = configure_logging()
+
+@app.on_event("shutdown")
+async def shutdown_logging():
+    """Flush and stop the background log listener"""
+    app.state.log_listener.stop()
+
+@app.on_event("startup")
+async def startup_google_client():
+    """Open the pooled client for Google token checks"""
+    await google_auth_service.open()
+
+@app.on_event("shutdown")
+async def shutdown_google_client():
+    """Close the pooled client for Google token checks"""
+    await google_auth_service.close()
+
+@app.on_event("startup")
+async def startup_eviction_listener():
+    """Drop cached items written by other processes"""
+    app.state.eviction_listener = asyncio.create_task(db_service.listen_for_evictions())
+
+@app.on_event("shutdown")
+async def shutdown_eviction_listener():
+    """Stop listening for evictions"""
+    app.state.eviction_listener.cancel()
+
+@app.on_event("shutdown")
+async def shutdown_db():
+    """Close the process's shared DynamoDB client"""
+    await db_service.close()
+
+# Compress larger JSON payloads such as list pages
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
 
 # Dependency to get current admin
-async def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+async def get_current_admin(token: str = Depends(bearer_token)) -> Dict:
     """Get current authenticated admin"""
     try:
-        user_data = google_auth_service.verify_jwt_token(credentials.credentials)
-        user = await db_service.get_user(user_data["user_id"])
+        claims = google_auth_service.verify_jwt_token(token)
+        
+        # Role and status come from the user record, not the token, so a
+        # demotion or deactivation applies on every worker. The read is
+        # served by the short-lived item cache, which writes evict
+        user = await db_service.get_user(claims["user_id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        if user["role"] != UserRole.ADMIN:
+        if user["role"] != _ADMIN or not user.get("is_active", True):
             raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
         
         return user
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=401, detail="Invalid authentication")
 
+# Dependency to get the request timestamp
+def now_ts(request: Request) -> datetime:
+    """Get a single UTC timestamp shared by everything in this request"""
+    now = getattr(request.state, "now", None)
+    if now is None:
+        now = request.state.now = datetime.utcnow()
+    return now
+
+# Short-lived per-process cache for dashboard aggregates and shop listings.
+# Admin writes clear it in every worker through ADMIN_CACHE_CHANNEL; writes
+# made by the other services only show up once the TTL expires
+admin_cache = TTLCache(maxsize=32, ttl=30)
+ADMIN_CACHE_CHANNEL = "admin-cache-invalidations"
+# Computations in flight, so concurrent misses of one key share a single
+# computation without blocking misses of other keys
+_admin_inflight: Dict[str, asyncio.Future] = {}
+
+async def _compute_cached(key, compute):
+    """Compute a value and cache it, unless the cache was invalidated meanwhile"""
+    value = await compute()
+    if _admin_inflight.get(key) is asyncio.current_task():
+        admin_cache[key] = value
+    return value
+
+async def get_cached(key, compute):
+    """Return the cached value for key, computing it once on a miss"""
+    value = admin_cache.get(key)
+    if value is not None:
+        return value
+    
+    load = _admin_inflight.get(key)
+    if load is None:
+        load = asyncio.ensure_future(_compute_cached(key, compute))
+        _admin_inflight[key] = load
+        load.add_done_callback(lambda done: _admin_inflight.pop(key) if _admin_inflight.get(key) is done else None)
+    # Shielded so one cancelled request does not cancel the others' computation
+    return await asyncio.shield(load)
+
+def _drop_admin_cache(message: str = ""):
+    """Drop this process's cached aggregates"""
+    admin_cache.clear()
+    # Computations started before the write must not cache their results
+    _admin_inflight.clear()
+
+async def invalidate_admin_cache():
+    """Drop cached aggregates after a write, in every admin worker"""
+    _drop_admin_cache()
+    await cache_service.publish(ADMIN_CACHE_CHANNEL, "all")
+
+@app.on_event("startup")
+async def startup_admin_cache_listener():
+    """Drop cached aggregates when another worker invalidates them"""
+    app.state.admin_cache_listener = asyncio.create_task(cache_service.listen(ADMIN_CACHE_CHANNEL, _drop_admin_cache))
+
+@app.on_event("shutdown")
+async def shutdown_admin_cache_listener():
+    """Stop listening for admin cache invalidations"""
+    app.state.admin_cache_listener.cancel()
+
 # Pydantic models for requests
 from pydantic import BaseModel
 
@@ -85,7 +195,9 @@ class ReviewModerationRequest(BaseModel):
     admin_notes: Optional[str] = None
 
 # Authentication routes
-@app.post("/auth/google", response_model=AuthResponse)
+# AuthResponse documents the schema only; the dict is returned as-is to
+# skip re-validating the user record on every login
+@app.post("/auth/google", responses={200: {"model": AuthResponse}})
 async def google_auth(auth_request: GoogleAuthRequest):
     """Authenticate admin with Google OAuth"""
     try:
@@ -98,79 +210,115 @@ async def google_auth(auth_request: GoogleAuthRequest):
             auth_result["user"]["role"] = UserRole.ADMIN
             user_model = BaseUser(**auth_result["user"])
             user = await db_service.create_user(user_model)
-        elif user["role"] != UserRole.ADMIN:
-            # Update role to admin if needed
+        elif user["role"] != _ADMIN:
+            # Update role to admin if needed; awaited so the next request sees it
             await db_service.update_user(user["user_id"], {"role": UserRole.ADMIN})
             user["role"] = UserRole.ADMIN
         
-        return AuthResponse(
-            token=auth_result["token"],
-            user=user
-        )
+        # Issue the token from the resolved user so its claims carry the admin role
+        return {
+            "token": google_auth_service.create_jwt_token(user),
+            "user": user
+        }
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         raise HTTPException(status_code=401, detail="Authentication failed")
 
 # Dashboard routes
+async def _seed_stats() -> Dict:
+    """Count every table once to seed the dashboard counters item"""
+    seeded_from = await db_service.claim_stats()
+    
+    # Fetch all tables concurrently
+    results = await asyncio.gather(
+        db_service.get_all_users(),
+        db_service.get_all_shops(),
+        db_service.get_all_orders(),
+        db_service.get_all_reviews(),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    if seeded_from is not None:
+        # Items created since the claim are counted by their own writes
+        results = [[item for item in items if created_before(item, seeded_from)] for items in results]
+    all_users, all_shops, all_orders, all_reviews = results
+    
+    stats = compute_stats(all_users, all_shops, all_orders, all_reviews)
+    
+    # Another instance is seeding or has seeded; until it is done this
+    # scan's totals are served without being written
+    if seeded_from is None:
+        return await db_service.get_stats() or stats
+    return await db_service.finish_stats(stats, seeded_from) or stats
+
+async def _compute_dashboard() -> Dict:
+    """Build the dashboard overview from the counters item"""
+    results = await asyncio.gather(
+        db_service.get_stats(),
+        db_service.list_orders(10),
+        db_service.list_reviews(10),
+        db_service.list_shops(10),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    stats, (recent_orders, _), (recent_reviews, _), (recent_shops, _) = results
+    
+    # Full scan only on cold start, before the counters exist
+    if stats is None:
+        stats = await _seed_stats()
+    
+    return {
+        "statistics": stats,
+        "recent_activity": {
+            "recent_orders": recent_orders,
+            "recent_reviews": recent_reviews,
+            "recent_shops": recent_shops
+        }
+    }
+
 @app.get("/dashboard")
 async def get_dashboard(current_admin: Dict = Depends(get_current_admin)):
     """Get admin dashboard overview"""
     try:
-        # Get all users
-        all_users = await db_service.get_all_users()
-        
-        # Get all shops
-        all_shops = await db_service.get_all_shops()
-        
-        # Get all orders
-        all_orders = await db_service.get_all_orders()
-        
-        # Get all reviews
-        all_reviews = await db_service.get_all_reviews()
-        
-        # Calculate statistics
-        total_users = len(all_users)
-        total_shops = len(all_shops)
-        total_orders = len(all_orders)
-        total_reviews = len(all_reviews)
-        
-        pending_shop_approvals = len([s for s in all_shops if s["status"] == ShopStatus.PENDING_APPROVAL])
-        pending_orders = len([o for o in all_orders if o["status"] == OrderStatus.PENDING])
-        pending_reviews = len([r for r in all_reviews if not r["is_approved"]])
-        
-        total_revenue = sum(o["total_amount"] for o in all_orders if o["status"] == OrderStatus.DELIVERED)
-        
-        return {
-            "statistics": {
-                "total_users": total_users,
-                "total_shops": total_shops,
-                "total_orders": total_orders,
-                "total_reviews": total_reviews,
-                "pending_shop_approvals": pending_shop_approvals,
-                "pending_orders": pending_orders,
-                "pending_reviews": pending_reviews,
-                "total_revenue": total_revenue
-            },
-            "recent_activity": {
-                "recent_orders": all_orders[-10:],  # Last 10 orders
-                "recent_reviews": all_reviews[-10:],  # Last 10 reviews
-                "recent_shops": all_shops[-10:]  # Last 10 shops
-            }
-        }
+        return await get_cached("dashboard", _compute_dashboard)
     except Exception as e:
-        logger.error(f"Error fetching dashboard: {str(e)}")
+        logger.error("Error fetching dashboard: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch dashboard")
 
+@app.post("/cache/invalidate")
+async def invalidate_cache(current_admin: Dict = Depends(get_current_admin)):
+    """Drop cached dashboard aggregates and shop listings"""
+    await invalidate_admin_cache()
+    return {"message": "Cache invalidated"}
+
 # Shop approval routes
+async def list_shops_cached(status: Optional[ShopStatus], limit: int, cursor: Optional[str]):
+    """Get a page of shops, shared by every route listing the same status"""
+    if status:
+        compute = lambda: db_service.query_shops_by_status(status.value, limit, cursor)
+    else:
+        compute = lambda: db_service.list_shops(limit, cursor)
+    
+    return await get_cached(f"shops:{status.value if status else 'all'}:{limit}:{cursor}", compute)
+
 @app.get("/shops/pending")
-async def get_pending_shops(current_admin: Dict = Depends(get_current_admin)):
+async def get_pending_shops(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_admin: Dict = Depends(get_current_admin)
+):
     """Get shops pending approval"""
     try:
-        all_shops = await db_service.get_all_shops()
-        pending_shops = [s for s in all_shops if s["status"] == ShopStatus.PENDING_APPROVAL]
-        return {"shops": pending_shops}
+        pending_shops, next_cursor = await list_shops_cached(ShopStatus.PENDING_APPROVAL, limit, cursor)
+        return {"shops": pending_shops, "next_cursor": next_cursor}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
-        logger.error(f"Error fetching pending shops: {str(e)}")
+        logger.error("Error fetching pending shops: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch pending shops")
 
 @app.put("/shops/{shop_id}/approval")
@@ -181,53 +329,53 @@ async def approve_shop(
 ):
     """Approve or reject a shop"""
     try:
-        shop = await db_service.get_shop(shop_id)
-        if not shop:
+        # The status write stamps updated_at; the reason goes in the same write
+        fields = {"approval_reason": approval_data.reason} if approval_data.reason else None
+        updated_shop = await db_service.update_shop_status(shop_id, approval_data.status, fields)
+        if not updated_shop:
             raise HTTPException(status_code=404, detail="Shop not found")
         
-        # Update shop status
-        updates = {
-            "status": approval_data.status,
-            "updated_at": datetime.utcnow()
-        }
-        
-        if approval_data.reason:
-            updates["approval_reason"] = approval_data.reason
-        
-        updated_shop = await db_service.update_shop_status(shop_id, approval_data.status)
+        await invalidate_admin_cache()
+        await cache_service.delete_prefix(APPROVED_SHOPS_PREFIX)
         return updated_shop
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating shop approval: {str(e)}")
+        logger.error("Error updating shop approval: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update shop approval")
 
 @app.get("/shops")
 async def get_all_shops(
     status: Optional[ShopStatus] = None,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get all shops with optional status filter"""
     try:
-        all_shops = await db_service.get_all_shops()
-        
-        if status:
-            all_shops = [s for s in all_shops if s["status"] == status]
-        
-        return {"shops": all_shops}
+        shops, next_cursor = await list_shops_cached(status, limit, cursor)
+        return {"shops": shops, "next_cursor": next_cursor}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
-        logger.error(f"Error fetching shops: {str(e)}")
+        logger.error("Error fetching shops: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch shops")
 
 # User management routes
 @app.get("/users")
-async def get_all_users(current_admin: Dict = Depends(get_current_admin)):
+async def get_all_users(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_admin: Dict = Depends(get_current_admin)
+):
     """Get all users"""
     try:
-        all_users = await db_service.get_all_users()
-        return {"users": all_users}
+        users, next_cursor = await db_service.list_users(limit, cursor)
+        return {"users": users, "next_cursor": next_cursor}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
-        logger.error(f"Error fetching users: {str(e)}")
+        logger.error("Error fetching users: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch users")
 
 @app.get("/users/{user_id}")
@@ -242,7 +390,7 @@ async def get_user(user_id: str, current_admin: Dict = Depends(get_current_admin
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching user: {str(e)}")
+        logger.error("Error fetching user: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch user")
 
 @app.put("/users/{user_id}/role")
@@ -253,62 +401,67 @@ async def update_user_role(
 ):
     """Update user role"""
     try:
-        user = await db_service.get_user(user_id)
-        if not user:
+        updated_user = await db_service.update_user(user_id, {"role": role_data.role})
+        if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        updated_user = await db_service.update_user(user_id, {"role": role_data.role})
+        await invalidate_admin_cache()
         return updated_user
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating user role: {str(e)}")
+        logger.error("Error updating user role: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update user role")
 
 @app.put("/users/{user_id}/status")
 async def update_user_status(
     user_id: str,
     status_data: UserStatusUpdate,
-    current_admin: Dict = Depends(get_current_admin)
+    current_admin: Dict = Depends(get_current_admin),
+    now: datetime = Depends(now_ts)
 ):
     """Update user active status"""
     try:
-        user = await db_service.get_user(user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
         updates = {
             "is_active": status_data.is_active,
-            "updated_at": datetime.utcnow()
+            "updated_at": now
         }
         
         if status_data.reason:
             updates["status_reason"] = status_data.reason
         
         updated_user = await db_service.update_user(user_id, updates)
+        if not updated_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        await invalidate_admin_cache()
         return updated_user
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating user status: {str(e)}")
+        logger.error("Error updating user status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update user status")
 
 # Order management routes
 @app.get("/orders")
 async def get_all_orders(
     status: Optional[OrderStatus] = None,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get all orders with optional status filter"""
     try:
-        all_orders = await db_service.get_all_orders()
-        
         if status:
-            all_orders = [o for o in all_orders if o["status"] == status]
+            orders, next_cursor = await db_service.query_orders_by_status(status.value, limit, cursor)
+        else:
+            orders, next_cursor = await db_service.list_orders(limit, cursor)
         
-        return {"orders": all_orders}
+        return {"orders": orders, "next_cursor": next_cursor}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
-        logger.error(f"Error fetching orders: {str(e)}")
+        logger.error("Error fetching orders: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch orders")
 
 @app.get("/orders/{order_id}")
@@ -323,7 +476,7 @@ async def get_order(order_id: str, current_admin: Dict = Depends(get_current_adm
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching order: {str(e)}")
+        logger.error("Error fetching order: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch order")
 
 @app.put("/orders/{order_id}/status")
@@ -334,43 +487,40 @@ async def update_order_status(
 ):
     """Update order status (admin override)"""
     try:
-        order = await db_service.get_order(order_id)
-        if not order:
+        # The status write stamps updated_at; the notes go in the same write
+        fields = {"admin_notes": status_data.admin_notes} if status_data.admin_notes else None
+        updated_order = await db_service.update_order_status(order_id, status_data.status, fields=fields)
+        if not updated_order:
             raise HTTPException(status_code=404, detail="Order not found")
         
-        # Update order status
-        updates = {
-            "status": status_data.status,
-            "updated_at": datetime.utcnow()
-        }
-        
-        if status_data.admin_notes:
-            updates["admin_notes"] = status_data.admin_notes
-        
-        updated_order = await db_service.update_order_status(order_id, status_data.status)
+        await invalidate_admin_cache()
         return updated_order
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating order status: {str(e)}")
+        logger.error("Error updating order status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update order status")
 
 # Review moderation routes
 @app.get("/reviews")
 async def get_all_reviews(
     is_approved: Optional[bool] = None,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get all reviews with optional approval filter"""
     try:
-        all_reviews = await db_service.get_all_reviews()
-        
         if is_approved is not None:
-            all_reviews = [r for r in all_reviews if r["is_approved"] == is_approved]
+            reviews, next_cursor = await db_service.query_reviews_by_approval(is_approved, limit, cursor)
+        else:
+            reviews, next_cursor = await db_service.list_reviews(limit, cursor)
         
-        return {"reviews": all_reviews}
+        return {"reviews": reviews, "next_cursor": next_cursor}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
-        logger.error(f"Error fetching reviews: {str(e)}")
+        logger.error("Error fetching reviews: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch reviews")
 
 @app.get("/reviews/{review_id}")
@@ -385,7 +535,7 @@ async def get_review(review_id: str, current_admin: Dict = Depends(get_current_a
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching review: {str(e)}")
+        logger.error("Error fetching review: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch review")
 
 @app.put("/reviews/{review_id}/moderation")
@@ -396,22 +546,22 @@ async def moderate_review(
 ):
     """Moderate a review (approve/reject)"""
     try:
-        review = await db_service.get_review(review_id)
-        if not review:
+        updated_review = await db_service.update_review_moderation(
+            review_id,
+            moderation_data.is_approved,
+            moderation_data.admin_notes,
+            current_admin["user_id"]
+        )
+        if not updated_review:
             raise HTTPException(status_code=404, detail="Review not found")
         
-        # This would need to be implemented in the database service
-        # For now, return the review with updated moderation status
-        review["is_approved"] = moderation_data.is_approved
-        review["admin_notes"] = moderation_data.admin_notes
-        review["moderated_at"] = datetime.utcnow()
-        review["moderated_by"] = current_admin["user_id"]
+        await invalidate_admin_cache()
         
-        return review
+        return updated_review
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error moderating review: {str(e)}")
+        logger.error("Error moderating review: %s", e)
         raise HTTPException(status_code=500, detail="Failed to moderate review")
 
 # Profile routes
@@ -435,9 +585,17 @@ async def update_profile(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003) 
\ No newline at end of file
+    # Multiple workers need the app as an import string
+    uvicorn.run(
+        "admin_api.main:app",
+        host="0.0.0.0",
+        port=8003,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
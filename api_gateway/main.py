@@ -2,31 +2,31 @@
 API Gateway - Routes requests to appropriate backend services
 """
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, StreamingResponse
+from starlette.background import BackgroundTask
+import asyncio
 import httpx
 import logging
-from typing import Dict, Any
+import os
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+from api_gateway.routing import build_route_trie, lookup_service, route_depth
+from shared.utils.cors import add_cors
+from shared.utils.logging_config import configure_logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="API Gateway",
     description="API Gateway for Three-App Architecture",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+add_cors(app)
 
 # Service URLs
 SERVICES = {
@@ -35,6 +35,24 @@ SERVICES = {
     "admin": "http://localhost:8003"
 }
 
+# Shared upstream client, created on startup so connections are pooled
+# and kept alive across proxied requests
+UPSTREAM_TIMEOUT = 30.0
+UPSTREAM_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+
+@app.on_event("startup")
+async def startup_http_client():
+    """Start logging and open the pooled upstream HTTP client"""
+    # Configured per worker here rather than at import time
+    app.state.log_listener = configure_logging()
+    app.state.http = httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT, limits=UPSTREAM_LIMITS)
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """Close the pooled upstream HTTP client and flush logs"""
+    await app.state.http.aclose()
+    app.state.log_listener.stop()
+
 # Route patterns
 ROUTE_PATTERNS = {
     "customer": [
@@ -65,57 +83,30 @@ ROUTE_PATTERNS = {
     ]
 }
 
+ROUTE_TRIE = build_route_trie(ROUTE_PATTERNS)
+ROUTE_DEPTH = route_depth(ROUTE_PATTERNS)
+
+@lru_cache(maxsize=4096)
+def _lookup_service(segments: Tuple[str, ...]) -> str:
+    """Resolve leading path segments to a service"""
+    # Default to customer service for unknown routes
+    return lookup_service(ROUTE_TRIE, segments, "customer")
+
 def determine_service(path: str) -> str:
     """Determine which service should handle the request based on path"""
-    # Check exact matches first
-    for service, patterns in ROUTE_PATTERNS.items():
-        for pattern in patterns:
-            if path.startswith(pattern):
-                return service
-    
-    # Default to customer service for unknown routes
-    return "customer"
+    # Segments deeper than the longest pattern cannot change the match
+    segments = path.strip("/").split("/", ROUTE_DEPTH)[:ROUTE_DEPTH]
+    return _lookup_service(tuple(segments))
 
-@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
-async def proxy_request(request: Request, path: str):
-    """Proxy request to appropriate backend service"""
-    try:
-        # Determine target service
-        service = determine_service(f"/{path}")
-        target_url = f"{SERVICES[service]}/{path}"
-        
-        logger.info(f"Routing {request.method} {path} to {service} service")
-        
-        # Get request body
-        body = None
-        if request.method in ["POST", "PUT", "PATCH"]:
-            body = await request.body()
-        
-        # Get headers
-        headers = dict(request.headers)
-        # Remove host header to avoid conflicts
-        headers.pop("host", None)
-        
-        # Forward request
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                params=request.query_params,
-                headers=headers,
-                content=body,
-                timeout=30.0
-            )
-        
-        # Return response
-        return response
-        
-    except httpx.RequestError as e:
-        logger.error(f"Request error: {str(e)}")
-        raise HTTPException(status_code=503, detail="Service unavailable")
-    except Exception as e:
-        logger.error(f"Gateway error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+# Connection-level headers that must not be forwarded by a proxy
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "content-length"
+}
+
+def strip_hop_by_hop(headers) -> Dict[str, str]:
+    """Copy headers, dropping hop-by-hop ones"""
+    return {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
 
 @app.get("/")
 async def root():
@@ -134,24 +125,83 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
     health_status = {
         "gateway": "healthy",
         "services": {}
     }
     
-    # Check each service
-    async with httpx.AsyncClient() as client:
-        for service_name, service_url in SERVICES.items():
-            try:
-                response = await client.get(f"{service_url}/health", timeout=5.0)
-                health_status["services"][service_name] = "healthy" if response.status_code == 200 else "unhealthy"
-            except Exception:
-                health_status["services"][service_name] = "unreachable"
+    # Check all services concurrently
+    client = request.app.state.http
+    responses = await asyncio.gather(
+        *(client.get(f"{service_url}/health", timeout=5.0) for service_url in SERVICES.values()),
+        return_exceptions=True
+    )
+    
+    for service_name, response in zip(SERVICES, responses):
+        if isinstance(response, Exception):
+            health_status["services"][service_name] = "unreachable"
+        else:
+            health_status["services"][service_name] = "healthy" if response.status_code == 200 else "unhealthy"
     
     return health_status
 
+@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
+async def proxy_request(request: Request, path: str):
+    """Proxy request to appropriate backend service"""
+    try:
+        # Determine target service
+        service = determine_service(f"/{path}")
+        target_url = f"{SERVICES[service]}/{path}"
+        
+        logger.info("Routing %s %s to %s service", request.method, path, service)
+        
+        # Get request body
+        body = None
+        if request.method in ["POST", "PUT", "PATCH"]:
+            body = await request.body()
+        
+        # Get headers
+        headers = strip_hop_by_hop(request.headers)
+        # Remove host header to avoid conflicts
+        headers.pop("host", None)
+        
+        # Forward request
+        client = request.app.state.http
+        upstream_request = client.build_request(
+            method=request.method,
+            url=target_url,
+            params=request.query_params,
+            headers=headers,
+            content=body
+        )
+        upstream = await client.send(upstream_request, stream=True)
+        
+        # Pipe the upstream body through instead of buffering it; raw bytes
+        # keep any upstream Content-Encoding intact for the client
+        return StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            headers=strip_hop_by_hop(upstream.headers),
+            background=BackgroundTask(upstream.aclose)
+        )
+    
+    except httpx.RequestError as e:
+        logger.error("Request error: %s", e)
+        raise HTTPException(status_code=503, detail="Service unavailable")
+    except Exception as e:
+        logger.error("Gateway error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Multiple workers need the app as an import string
+    uvicorn.run(
+        "api_gateway.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
@@ -0,0 +1,44 @@
+"""
+Prefix routing for the API Gateway
+
+Pure, fully typed functions so the module can be compiled with mypyc.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+# Key under which a trie node records the service owning that prefix
+SERVICE_KEY = "__service__"
+
+
+def build_route_trie(route_patterns: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Compile route patterns into a trie keyed by path segment"""
+    trie: Dict[str, Any] = {}
+    for service, patterns in route_patterns.items():
+        for pattern in patterns:
+            node = trie
+            for segment in pattern.strip("/").split("/"):
+                node = node.setdefault(segment, {})
+            # Earlier services keep priority over later ones for shared prefixes
+            node.setdefault(SERVICE_KEY, service)
+    return trie
+
+
+def route_depth(route_patterns: Dict[str, List[str]]) -> int:
+    """Number of path segments in the longest route pattern"""
+    return max(
+        len(pattern.strip("/").split("/"))
+        for patterns in route_patterns.values()
+        for pattern in patterns
+    )
+
+
+def lookup_service(trie: Dict[str, Any], segments: Tuple[str, ...], default: str) -> str:
+    """Walk the route trie and return the deepest matching service"""
+    node = trie
+    service: Optional[str] = None
+    for segment in segments:
+        child = node.get(segment)
+        if child is None:
+            break
+        node = child
+        service = node.get(SERVICE_KEY, service)
+    return service or default
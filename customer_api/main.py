@@ -2,48 +2,90 @@
 Customer API - FastAPI backend for customer app
 """
 from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Dict, Optional, Any
 from datetime import datetime
+import asyncio
+import math
+import secrets
+import time
 import uuid
 import logging
+import os
 
+from shared.auth.bearer import bearer_token
 from shared.auth.google_auth import google_auth_service
+from shared.cache.redis_cache import cache_service, APPROVED_SHOPS_PREFIX, APPROVED_SHOPS_TTL
 from shared.database.dynamodb import db_service
 from shared.models.base import (
-    BaseUser, Shop, Product, Order, Review, Address, 
+    BaseUser, Shop, Product, Order, OrderItem, Review, Address, 
     UserRole, OrderStatus, DeliveryType
 )
+from shared.utils.streaming import stream_json_list
+from shared.utils.cors import add_cors
+from shared.utils.logging_config import configure_logging
+from shared.utils.profiling import add_profiling
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Enum value as a plain string, compared against what DynamoDB returns
+_DELIVERED = OrderStatus.DELIVERED.value
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Customer API",
     description="Backend API for Customer App",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+add_cors(app)
+
+# Profile single requests with ?profile=1 when PROFILING=true
+add_profiling(app)
+
+# Logging is configured per worker on startup, not at import time
+@app.on_event("startup")
+async def startup_logging():
+    """Start the background log listener"""
+    app.state.log_listener = configure_logging()
+
+@app.on_event("shutdown")
+async def shutdown_logging():
+    """Flush and stop the background log listener"""
+    app.state.log_listener.stop()
+
+@app.on_event("startup")
+async def startup_google_client():
+    """Open the pooled client for Google token checks"""
+    await google_auth_service.open()
+
+@app.on_event("shutdown")
+async def shutdown_google_client():
+    """Close the pooled client for Google token checks"""
+    await google_auth_service.close()
 
-# Security
-security = HTTPBearer()
+@app.on_event("startup")
+async def startup_eviction_listener():
+    """Drop cached items written by other processes"""
+    app.state.eviction_listener = asyncio.create_task(db_service.listen_for_evictions())
+
+@app.on_event("shutdown")
+async def shutdown_eviction_listener():
+    """Stop listening for evictions"""
+    app.state.eviction_listener.cancel()
+
+@app.on_event("shutdown")
+async def shutdown_db():
+    """Close the process's shared DynamoDB client"""
+    await db_service.close()
 
 # Dependency to get current user
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+async def get_current_user(token: str = Depends(bearer_token)) -> Dict:
     """Get current authenticated user"""
     try:
-        user_data = google_auth_service.verify_jwt_token(credentials.credentials)
+        user_data = google_auth_service.verify_jwt_token(token)
         user = await db_service.get_user(user_data["user_id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -52,48 +94,52 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=401, detail="Invalid authentication")
 
 # Pydantic models for requests
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
-class GoogleAuthRequest(BaseModel):
+class RequestModel(BaseModel):
+    """Base for request bodies: reject unknown fields and never mutate"""
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+class GoogleAuthRequest(RequestModel):
     access_token: str
 
 class AuthResponse(BaseModel):
     token: str
     user: Dict[str, Any]
 
-class AddressCreate(BaseModel):
+class AddressCreate(RequestModel):
     label: str
     street_address: str
     city: str
     state: str
-    postal_code: str
+    postal_code: str = Field(..., pattern=r'^[A-Za-z0-9 -]{3,12}$')
     country: str
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     is_default: bool = False
 
-class CartItem(BaseModel):
+class CartItem(RequestModel):
     product_id: str
     variant_id: str
-    quantity: int
+    quantity: int = Field(..., ge=1, le=1000)
 
-class OrderCreate(BaseModel):
+class OrderCreate(RequestModel):
     shop_id: str
     items: List[CartItem]
     delivery_type: DeliveryType
     delivery_address: Optional[str] = None
     customer_notes: Optional[str] = None
 
-class ReviewCreate(BaseModel):
+class ReviewCreate(RequestModel):
     shop_id: Optional[str] = None
     product_id: Optional[str] = None
     order_id: str
-    rating: int
+    rating: int = Field(..., ge=1, le=5)
     title: Optional[str] = None
     comment: Optional[str] = None
 
 # Authentication routes
-@app.post("/auth/google", response_model=AuthResponse)
+@app.post("/auth/google", responses={200: {"model": AuthResponse}})
 async def google_auth(auth_request: GoogleAuthRequest):
     """Authenticate user with Google OAuth"""
     try:
@@ -106,15 +152,26 @@ async def google_auth(auth_request: GoogleAuthRequest):
             user_model = BaseUser(**auth_result["user"])
             user = await db_service.create_user(user_model)
         
-        return AuthResponse(
-            token=auth_result["token"],
-            user=user
-        )
+        # Documented as AuthResponse but returned as-is, skipping response validation
+        return {
+            "token": auth_result["token"],
+            "user": user
+        }
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         raise HTTPException(status_code=401, detail="Authentication failed")
 
 # Shop routes
+# Listing queries in flight, so requests missing the same key at once
+# (e.g. right after it expires) share a single DynamoDB query
+_approved_shops_inflight: Dict[str, asyncio.Future] = {}
+
+async def _load_approved_shops(key: str, category: Optional[str], search: Optional[str], is_open: Optional[bool]) -> List[Dict]:
+    """Query approved shops and cache the listing"""
+    shops = await db_service.get_approved_shops(category, search, is_open)
+    await cache_service.set(key, shops, APPROVED_SHOPS_TTL)
+    return shops
+
 @app.get("/shops")
 async def get_shops(
     category: Optional[str] = None,
@@ -123,18 +180,21 @@ async def get_shops(
 ):
     """Get approved shops with optional filters"""
     try:
-        shops = await db_service.get_approved_shops(category)
-        
-        # Apply additional filters
-        if search:
-            shops = [s for s in shops if search.lower() in s["name"].lower()]
-        
-        if is_open is not None:
-            shops = [s for s in shops if s["is_open"] == is_open]
+        search = search.lower() if search else None
+        key = f"{APPROVED_SHOPS_PREFIX}{category or ''}:{search or ''}:{is_open}"
+        shops = await cache_service.get(key)
+        if shops is None:
+            load = _approved_shops_inflight.get(key)
+            if load is None:
+                load = asyncio.ensure_future(_load_approved_shops(key, category, search, is_open))
+                _approved_shops_inflight[key] = load
+                load.add_done_callback(lambda _: _approved_shops_inflight.pop(key, None))
+            # Shielded so one cancelled request does not cancel the others' query
+            shops = await asyncio.shield(load)
         
         return {"shops": shops}
     except Exception as e:
-        logger.error(f"Error fetching shops: {str(e)}")
+        logger.error("Error fetching shops: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch shops")
 
 @app.get("/shops/{shop_id}")
@@ -152,7 +212,7 @@ async def get_shop(shop_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching shop: {str(e)}")
+        logger.error("Error fetching shop: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch shop")
 
 # Product routes
@@ -160,22 +220,34 @@ async def get_shop(shop_id: str):
 async def get_shop_products(shop_id: str, category: Optional[str] = None):
     """Get products for a specific shop"""
     try:
+        # The shop is usually served from the item caches, so its status
+        # check costs no extra round-trip; the first page is read alongside
+        results = await asyncio.gather(
+            db_service.get_shop(shop_id),
+            db_service.get_products_page_by_shop(shop_id, category),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        shop, (products, next_cursor) = results
+        
         # Verify shop exists and is approved
-        shop = await db_service.get_shop(shop_id)
         if not shop or shop["status"] != "approved":
             raise HTTPException(status_code=404, detail="Shop not found")
         
-        products = await db_service.get_products_by_shop(shop_id)
-        
-        # Filter by category if provided
-        if category:
-            products = [p for p in products if p["category"] == category]
-        
-        return {"products": products}
+        # Stream any further pages instead of collecting them first
+        return StreamingResponse(
+            stream_json_list(
+                "products", products, next_cursor,
+                lambda cursor: db_service.get_products_page_by_shop(shop_id, category, cursor)
+            ),
+            media_type="application/json"
+        )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching products: {str(e)}")
+        logger.error("Error fetching products: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch products")
 
 @app.get("/products/{product_id}")
@@ -190,7 +262,7 @@ async def get_product(product_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching product: {str(e)}")
+        logger.error("Error fetching product: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch product")
 
 # Address routes
@@ -202,7 +274,7 @@ async def get_addresses(current_user: Dict = Depends(get_current_user)):
         # For now, return empty list
         return {"addresses": []}
     except Exception as e:
-        logger.error(f"Error fetching addresses: {str(e)}")
+        logger.error("Error fetching addresses: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch addresses")
 
 @app.post("/addresses")
@@ -212,17 +284,18 @@ async def create_address(
 ):
     """Create a new address for the user"""
     try:
-        address = Address(
+        # Fields are validated AddressCreate input plus server IDs, so skip re-validation
+        address = Address.model_construct(
             address_id=str(uuid.uuid4()),
             user_id=current_user["user_id"],
-            **address_data.dict()
+            **address_data.model_dump()
         )
         
         # This would need to be implemented in the database service
         # For now, return the address data
-        return address.dict()
+        return address.model_dump()
     except Exception as e:
-        logger.error(f"Error creating address: {str(e)}")
+        logger.error("Error creating address: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create address")
 
 # Order routes
@@ -233,8 +306,19 @@ async def create_order(
 ):
     """Create a new order"""
     try:
+        # Fetch the shop and every product in the cart concurrently,
+        # the products with one batched read
+        results = await asyncio.gather(
+            db_service.get_shop(order_data.shop_id),
+            db_service.batch_get_products([c.product_id for c in order_data.items]),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        shop, products = results
+        
         # Validate shop exists and is accepting orders
-        shop = await db_service.get_shop(order_data.shop_id)
         if not shop or shop["status"] != "approved":
             raise HTTPException(status_code=404, detail="Shop not found")
         
@@ -243,42 +327,58 @@ async def create_order(
         
         # Calculate order totals
         items = []
-        subtotal = 0.0
+        item_totals = []
+        
+        # Variants indexed per product, built once even if a product repeats in the cart
+        variants_by_product: Dict[str, Dict[str, Dict]] = {}
+        
+        # One random base per order; line items get a counter suffix
+        item_id_base = uuid.uuid4().hex
         
-        for cart_item in order_data.items:
-            product = await db_service.get_product(cart_item.product_id)
+        for index, cart_item in enumerate(order_data.items):
+            product = products.get(cart_item.product_id)
             if not product:
                 raise HTTPException(status_code=404, detail=f"Product {cart_item.product_id} not found")
             
             # Find the variant
-            variant = next((v for v in product["variants"] if v["variant_id"] == cart_item.variant_id), None)
+            variants_by_id = variants_by_product.get(cart_item.product_id)
+            if variants_by_id is None:
+                variants_by_id = {v["variant_id"]: v for v in product["variants"]}
+                variants_by_product[cart_item.product_id] = variants_by_id
+            variant = variants_by_id.get(cart_item.variant_id)
             if not variant:
                 raise HTTPException(status_code=404, detail=f"Variant {cart_item.variant_id} not found")
             
             if variant["stock_quantity"] < cart_item.quantity:
                 raise HTTPException(status_code=400, detail=f"Insufficient stock for {product['name']}")
             
-            item_total = variant["selling_price"] * cart_item.quantity
-            subtotal += item_total
+            # Prices come back from DynamoDB as Decimal
+            unit_price = float(variant["selling_price"])
+            item_total = unit_price * cart_item.quantity
+            item_totals.append(item_total)
             
-            items.append({
-                "item_id": str(uuid.uuid4()),
-                "product_id": cart_item.product_id,
-                "variant_id": cart_item.variant_id,
-                "product_name": product["name"],
-                "variant_name": variant["name"],
-                "quantity": cart_item.quantity,
-                "unit_price": variant["selling_price"],
-                "total_price": item_total
-            })
+            items.append(OrderItem.model_construct(
+                item_id=f"{item_id_base}{index:04x}",
+                product_id=cart_item.product_id,
+                variant_id=cart_item.variant_id,
+                product_name=product["name"],
+                variant_name=variant["name"],
+                quantity=cart_item.quantity,
+                unit_price=unit_price,
+                total_price=item_total
+            ))
+        
+        # Sum all line totals in one call, without per-item rounding drift
+        subtotal = math.fsum(item_totals)
         
         # Calculate delivery fee
-        delivery_fee = shop["delivery_fee"] if order_data.delivery_type == DeliveryType.DELIVERY else 0.0
+        delivery_fee = float(shop["delivery_fee"]) if order_data.delivery_type == DeliveryType.DELIVERY else 0.0
         total_amount = subtotal + delivery_fee
         
-        # Create order
-        order = Order(
-            order_id=f"ORD{str(uuid.uuid4())[:8].upper()}",
+        # Create order; every field is server-computed from validated input,
+        # so skip re-validation
+        order = Order.model_construct(
+            order_id="ORD" + secrets.token_hex(4).upper(),
             customer_id=current_user["user_id"],
             shop_id=order_data.shop_id,
             items=items,
@@ -297,17 +397,26 @@ async def create_order(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating order: {str(e)}")
+        logger.error("Error creating order: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create order")
 
 @app.get("/orders")
 async def get_orders(current_user: Dict = Depends(get_current_user)):
     """Get user's order history"""
     try:
-        orders = await db_service.get_orders_by_customer(current_user["user_id"])
-        return {"orders": orders}
+        customer_id = current_user["user_id"]
+        orders, next_cursor = await db_service.get_orders_page_by_customer(customer_id)
+        
+        # Stream any further pages instead of collecting them first
+        return StreamingResponse(
+            stream_json_list(
+                "orders", orders, next_cursor,
+                lambda cursor: db_service.get_orders_page_by_customer(customer_id, cursor)
+            ),
+            media_type="application/json"
+        )
     except Exception as e:
-        logger.error(f"Error fetching orders: {str(e)}")
+        logger.error("Error fetching orders: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch orders")
 
 @app.get("/orders/{order_id}")
@@ -325,7 +434,7 @@ async def get_order(order_id: str, current_user: Dict = Depends(get_current_user
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching order: {str(e)}")
+        logger.error("Error fetching order: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch order")
 
 # Review routes
@@ -345,10 +454,11 @@ async def create_review(
             raise HTTPException(status_code=403, detail="Access denied")
         
         # Check if order is delivered
-        if order["status"] != OrderStatus.DELIVERED:
+        if order["status"] != _DELIVERED:
             raise HTTPException(status_code=400, detail="Can only review delivered orders")
         
-        review = Review(
+        # Rating is bounded by ReviewCreate, so skip re-validation
+        review = Review.model_construct(
             review_id=str(uuid.uuid4()),
             customer_id=current_user["user_id"],
             shop_id=review_data.shop_id,
@@ -362,12 +472,12 @@ async def create_review(
         
         # This would need to be implemented in the database service
         # For now, return the review data
-        return review.dict()
+        return review.model_dump()
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating review: {str(e)}")
+        logger.error("Error creating review: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create review")
 
 # Profile routes
@@ -391,9 +501,17 @@ async def update_profile(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001) 
\ No newline at end of file
+    # Multiple workers need the app as an import string
+    uvicorn.run(
+        "customer_api.main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
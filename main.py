@@ -3,15 +3,26 @@ FastAPI Backend for Market Merchant App
 Main application entry point with all routes and middleware
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, Body, Path, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Path, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response
+from fastapi.security import HTTPBearer
+from typing import List, Dict, Optional, Any, Callable, Iterable
+from collections import defaultdict
+from operator import itemgetter
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, ConfigDict, ValidationError
+import bisect
+import itertools
 import json
+import time
 import uuid
 import logging
+import secrets
+
+import orjson
+from cachetools import LRUCache
 
 # Configure logging
 logging.basicConfig(
@@ -21,13 +32,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, falling back to str() for other types"""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Market Merchant API",
     description="Backend API for Market Merchant Dashboard",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for React frontend
@@ -35,12 +53,68 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:8080"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Only the methods and headers the routes use, rather than wildcards
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
-# Security
-security = HTTPBearer()
+# Ids only need to be unique within this process's store
+_id_prefix = secrets.token_hex(2)
+_id_counter = itertools.count()
+
+
+def mkid(prefix: str) -> str:
+    """Mint a record id from the process prefix and a monotonic counter"""
+    return f"{prefix}_{_id_prefix}{next(_id_counter):06x}"
+
+_ts_cache = [0, ""]
+
+
+def now_iso() -> str:
+    """UTC ISO timestamp (+00:00 offset) at second precision, formatted once per second"""
+    second = int(time.time())
+    if second != _ts_cache[0]:
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(second))
+        _ts_cache[0] = second
+    return _ts_cache[1]
+
+# Encoded list responses kept per collection
+LIST_CACHE_SIZE = 256
+
+def _keys(value: Any) -> tuple:
+    """Index keys for a single optional attribute"""
+    return () if value is None else (value,)
+
+# Secondary index over one record collection
+class SecondaryIndex:
+    def __init__(self, keys_of: Callable[[Dict[str, Any]], Iterable]):
+        self.keys_of = keys_of
+        # key -> record ids, as an insertion-ordered dict used as a set
+        self.buckets = defaultdict(dict)
+    
+    def get(self, key: Any) -> Dict[str, None]:
+        """Ids of the records filed under key"""
+        return self.buckets.get(key, {})
+    
+    def add(self, item_id: str, record: Dict[str, Any]):
+        """File a record under each of its keys"""
+        for key in self.keys_of(record):
+            self.buckets[key][item_id] = None
+    
+    def discard(self, item_id: str, keys: Iterable):
+        """Remove a record from the given keys"""
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.pop(item_id, None)
+    
+    def move(self, item_id: str, old_keys: tuple, record: Dict[str, Any]):
+        """Refile a changed record, leaving buckets whose key is unchanged in place"""
+        new_keys = tuple(self.keys_of(record))
+        self.discard(item_id, [key for key in old_keys if key not in new_keys])
+        for key in new_keys:
+            if key not in old_keys:
+                self.buckets[key][item_id] = None
 
 # In-memory data store
 class MemoryStore:
@@ -50,8 +124,137 @@ class MemoryStore:
         self.orders = {}
         self.offers = {}
         self.sessions = {}
+        # Session lookup by bearer token
+        self.tokens = {}
         self.reviews = {}
+        # Calendar date of each order's created_at, parsed once per order
+        self.order_dates = {}
+        # merchant_id -> (created_at, order_id) pairs in ascending time order
+        self.orders_by_time = defaultdict(list)
+        # Encoded merchant records, dropped whenever the merchant changes
+        self._merchant_json = {}
+        # Merchant record by the shop ids it answers to (merchant_id or shop_id)
+        self.shop_index = {}
+        # Encoded list responses keyed by (collection, endpoint, *filters),
+        # kept per collection. Filters come straight from the request, so
+        # each collection only holds the most recently used encodings
+        self._cache = defaultdict(lambda: LRUCache(maxsize=LIST_CACHE_SIZE))
+        # (collection, id) -> [sum of review ratings, review count]
+        self.rating_totals = defaultdict(lambda: [0, 0])
+        
+        # Lookups by owner instead of scanning whole collections
+        self.products_by_merchant = SecondaryIndex(lambda p: _keys(p.get("merchant_id")))
+        self.orders_by_merchant = SecondaryIndex(lambda o: _keys(o.get("merchant_id")))
+        self.offers_by_merchant = SecondaryIndex(lambda o: _keys(o.get("merchant_id")))
+        self.reviews_by_product = SecondaryIndex(lambda r: _keys(r.get("product_id")))
+        self.reviews_by_shop = SecondaryIndex(lambda r: _keys(r.get("shop_id")))
+        # Active offers by the target they apply to
+        self.active_product_offers = SecondaryIndex(
+            lambda o: o.get("product_ids", ()) if o.get("level") == "product" and o.get("is_active") else ()
+        )
+        self.active_merchant_offers = SecondaryIndex(
+            lambda o: _keys(o.get("merchant_id")) if o.get("level") == "merchant" and o.get("is_active") else ()
+        )
+        self._collections = {
+            "products": (self.products, (self.products_by_merchant,)),
+            "orders": (self.orders, (self.orders_by_merchant,)),
+            "offers": (self.offers, (self.offers_by_merchant, self.active_product_offers, self.active_merchant_offers)),
+            "reviews": (self.reviews, (self.reviews_by_product, self.reviews_by_shop)),
+        }
+        
         self._init_mock_data()
+        for merchant in self.merchants.values():
+            self.index_shop(merchant)
+        for records, indexes in self._collections.values():
+            for item_id, record in records.items():
+                for index in indexes:
+                    index.add(item_id, record)
+        for order in self.orders.values():
+            self._record_order_time(order)
+    
+    def index_shop(self, merchant: Dict[str, Any]):
+        """File a merchant under its shop ids, keeping the first merchant for a shared id"""
+        for shop_id in (merchant.get("merchant_id"), merchant.get("shop_id")):
+            if shop_id is not None:
+                self.shop_index.setdefault(shop_id, merchant)
+    
+    def _record_order_time(self, order: Dict[str, Any]):
+        """Keep the creation date of an order and file it in its merchant's timeline"""
+        self.order_dates[order["order_id"]] = datetime.fromisoformat(order["created_at"]).date()
+        if order.get("merchant_id") is not None:
+            # Insert before equal timestamps so newest-first reads keep ties in store order
+            bisect.insort_left(
+                self.orders_by_time[order["merchant_id"]],
+                (order["created_at"], order["order_id"]),
+                key=itemgetter(0)
+            )
+    
+    def recent_orders(self, merchant_id: str) -> Iterable[str]:
+        """Order ids of a merchant, newest first"""
+        return (oid for _, oid in reversed(self.orders_by_time.get(merchant_id, ())))
+    
+    def insert(self, kind: str, item_id: str, record: Dict[str, Any]):
+        """Store a record and file it in its collection's indices"""
+        records, indexes = self._collections[kind]
+        records[item_id] = record
+        for index in indexes:
+            index.add(item_id, record)
+        self.changed(kind)
+    
+    def update(self, kind: str, item_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply changes to a stored record and refile it where its keys changed"""
+        records, indexes = self._collections[kind]
+        record = records[item_id]
+        old_keys = [tuple(index.keys_of(record)) for index in indexes]
+        record.update(changes)
+        for index, keys in zip(indexes, old_keys):
+            index.move(item_id, keys, record)
+        self.changed(kind)
+        return record
+    
+    def delete(self, kind: str, item_id: str):
+        """Remove a stored record and its index entries"""
+        records, indexes = self._collections[kind]
+        record = records.pop(item_id)
+        for index in indexes:
+            index.discard(item_id, index.keys_of(record))
+        self.changed(kind)
+    
+    def add_order(self, order: Dict[str, Any]):
+        """Store a new order"""
+        self.insert("orders", order["order_id"], order)
+        self._record_order_time(order)
+    
+    def merchant_json(self, merchant_id: str) -> bytes:
+        """JSON encoding of a merchant record, reused until the merchant changes"""
+        encoded = self._merchant_json.get(merchant_id)
+        if encoded is None:
+            encoded = self._merchant_json[merchant_id] = orjson.dumps(self.merchants[merchant_id], default=str)
+        return encoded
+    
+    def merchant_changed(self, merchant_id: str):
+        """Forget the cached encoding of a modified merchant"""
+        self._merchant_json.pop(merchant_id, None)
+    
+    def add_rating(self, kind: str, record_id: str, record: Dict[str, Any], rating: int):
+        """Fold a review into exact integer totals and refresh the record's average"""
+        totals = self.rating_totals[(kind, record_id)]
+        totals[0] += rating
+        totals[1] += 1
+        record["total_reviews"] = totals[1]
+        record["rating"] = round(totals[0] / totals[1], 2)
+    
+    def cached_json(self, key: tuple, build: Callable[[], Any]) -> Response:
+        """Serve a list response from its cached encoding, building it on a miss"""
+        cache = self._cache[key[0]]
+        encoded = cache.get(key)
+        if encoded is None:
+            encoded = cache[key] = orjson.dumps(build(), default=str, option=orjson.OPT_NON_STR_KEYS)
+        return Response(content=encoded, media_type="application/json")
+    
+    def changed(self, kind: str):
+        """Drop cached list encodings built from a modified collection"""
+        self._cache.pop(kind, None)
     
     def _init_mock_data(self):
         """Initialize with mock data matching React app expectations"""
@@ -71,7 +274,7 @@ class MemoryStore:
                 "accepting_orders": True,
                 "reason": None
             },
-            "created_at": "2024-01-15T10:00:00Z"
+            "created_at": "2024-01-15T10:00:00+00:00"
         }
         
         # Mock products
@@ -91,7 +294,8 @@ class MemoryStore:
                 "images": ["https://images.unsplash.com/photo-1560806887-1e4cd0b6cbd6?w=300&h=200&fit=crop"],
                 "is_active": True,
                 "weight": 1.0,
-                "created_at": "2024-01-15T10:00:00Z"
+                "offers": [],
+                "created_at": "2024-01-15T10:00:00+00:00"
             },
             "prod2": {
                 "product_id": "prod2",
@@ -108,7 +312,8 @@ class MemoryStore:
                 "images": ["https://images.unsplash.com/photo-1563636619-e9143da7973b?w=300&h=200&fit=crop"],
                 "is_active": True,
                 "weight": 1.0,
-                "created_at": "2024-01-15T11:00:00Z"
+                "offers": [],
+                "created_at": "2024-01-15T11:00:00+00:00"
             },
             "prod3": {
                 "product_id": "prod3",
@@ -124,7 +329,8 @@ class MemoryStore:
                 "images": ["https://images.unsplash.com/photo-1509440159596-0249088772ff?w=300&h=200&fit=crop"],
                 "is_active": True,
                 "weight": 0.5,
-                "created_at": "2024-01-15T12:00:00Z"
+                "offers": [],
+                "created_at": "2024-01-15T12:00:00+00:00"
             }
         })
         
@@ -143,7 +349,7 @@ class MemoryStore:
                 "status": "pending",
                 "delivery_type": "delivery",
                 "delivery_address": "123 Main St, Sector 17, Chandigarh",
-                "created_at": "2024-01-15T10:30:00Z",
+                "created_at": "2024-01-15T10:30:00+00:00",
                 "customer_notes": "Please deliver fresh items"
             },
             "ORD002": {
@@ -158,7 +364,7 @@ class MemoryStore:
                 "total_amount": 220.0,
                 "status": "preparing",
                 "delivery_type": "pickup",
-                "created_at": "2024-01-15T11:15:00Z",
+                "created_at": "2024-01-15T11:15:00+00:00",
                 "customer_notes": ""
             },
             "ORD003": {
@@ -173,7 +379,7 @@ class MemoryStore:
                 "status": "ready",
                 "delivery_type": "delivery",
                 "delivery_address": "456 Park St, Sector 22, Chandigarh",
-                "created_at": "2024-01-15T12:00:00Z",
+                "created_at": "2024-01-15T12:00:00+00:00",
                 "customer_notes": ""
             }
         })
@@ -188,8 +394,8 @@ class MemoryStore:
                 "type": "percentage",
                 "level": "category",
                 "discount_value": 20,
-                "valid_from": "2024-01-15T00:00:00Z",
-                "valid_till": "2024-01-31T23:59:59Z",
+                "valid_from": "2024-01-15T00:00:00+00:00",
+                "valid_till": "2024-01-31T23:59:59+00:00",
                 "is_active": True,
                 "usage_count": 15,
                 "conditions": {"min_order_value": 100, "max_discount": 50},
@@ -203,8 +409,8 @@ class MemoryStore:
                 "type": "buy_x_get_y",
                 "level": "category",
                 "discount_value": 0,
-                "valid_from": "2024-01-15T00:00:00Z",
-                "valid_till": "2024-02-15T23:59:59Z",
+                "valid_from": "2024-01-15T00:00:00+00:00",
+                "valid_till": "2024-02-15T23:59:59+00:00",
                 "is_active": True,
                 "usage_count": 8,
                 "conditions": {"buy_quantity": 2, "get_quantity": 1},
@@ -263,19 +469,102 @@ class ReviewCreate(BaseModel):
     shop_id: Optional[str] = None
     product_id: Optional[str] = None
 
-# Authentication helper
-def get_current_merchant(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
-    """Extract merchant ID from JWT token (simplified for demo)"""
-    token = credentials.credentials
+# Partial updates: unknown keys are dropped and only the fields a client
+# actually sent are applied
+class ProfileUpdate(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    business_name: Optional[str] = None
+    business_type: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    subscription_plan: Optional[str] = None
+
+class ProductUpdate(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    name: Optional[str] = None
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    brand: Optional[str] = None
+    description: Optional[str] = None
+    variants: Optional[List[Dict[str, Any]]] = None
+    images: Optional[List[str]] = None
+    is_active: Optional[bool] = None
+    weight: Optional[float] = None
+
+class OfferUpdate(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    name: Optional[str] = None
+    description: Optional[str] = None
+    type: Optional[str] = None
+    level: Optional[str] = None
+    discount_value: Optional[float] = None
+    valid_from: Optional[str] = None
+    valid_till: Optional[str] = None
+    is_active: Optional[bool] = None
+    conditions: Optional[Dict[str, Any]] = None
+    applicable_categories: Optional[List[str]] = None
+    product_ids: Optional[List[str]] = None
+
+class OrderCreate(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    shop_id: str
+    merchant_id: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_phone: Optional[str] = None
+    items: List[Dict[str, Any]] = []
+    total_amount: Optional[float] = None
+    delivery_type: Optional[str] = None
+    delivery_address: Optional[str] = None
+    customer_notes: Optional[str] = None
+
+# Request bodies are parsed straight from the raw bytes in one pass; routes
+# declare them after their auth dependency so auth errors still come first
+def json_body(model):
+    """Dependency validating the JSON request body with model_validate_json"""
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+    return Depends(parse)
+
+def body_schema(model) -> Dict[str, Any]:
+    """OpenAPI request body for a route that reads it through json_body"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}}
+
+def _get_or_404(records: Dict[str, Any], item_id: str, kind: str) -> Dict[str, Any]:
+    """Fetch a stored record with a single lookup, raising 404 when it is missing"""
+    record = records.get(item_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"{kind} not found")
+    return record
+
+# Authentication helpers
+class BearerAuth(HTTPBearer):
+    """Bearer scheme that resolves the caller id itself, without a nested credentials dependency"""
+    def __init__(self, resolve: Callable[[str], str]):
+        super().__init__()
+        self.resolve = resolve
     
+    async def __call__(self, request: Request) -> str:
+        authorization = request.headers.get("authorization")
+        if not authorization or authorization[:7].lower() != "bearer " or not authorization[7:]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+        return self.resolve(authorization[7:])
+
+def _merchant_for_token(token: str) -> str:
+    """Extract merchant ID from JWT token (simplified for demo)"""
     # For demo, accept any token and return merchant123
     if token and token.startswith(('mock', 'demo')):
         return "merchant123"
     
     # In real implementation, decode JWT and extract merchant_id
-    for session_id, session_data in memory_store.sessions.items():
-        if session_data.get("token") == token:
-            return session_data.get("merchant_id")
+    session_data = memory_store.tokens.get(token)
+    if session_data:
+        return session_data["merchant_id"]
     
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -283,6 +572,8 @@ def get_current_merchant(credentials: HTTPAuthorizationCredentials = Depends(sec
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+get_current_merchant = BearerAuth(_merchant_for_token)
+
 # Routes
 
 @app.get("/")
@@ -290,9 +581,9 @@ async def root():
     """Health check endpoint"""
     return {"message": "Market Merchant API is running", "timestamp": datetime.now()}
 
-@app.post("/auth/google", response_model=AuthResponse)
-async def google_auth(auth_request: GoogleAuthRequest):
-    logger.info(f"Received auth request with token: {auth_request.access_token}")
+@app.post("/auth/google", responses={200: {"model": AuthResponse}}, openapi_extra=body_schema(GoogleAuthRequest))
+async def google_auth(auth_request: GoogleAuthRequest = json_body(GoogleAuthRequest)):
+    logger.info("Received auth request with token: %s", auth_request.access_token)
 
     if not auth_request.access_token:
         logger.warning("Access token missing in auth request")
@@ -305,39 +596,48 @@ async def google_auth(auth_request: GoogleAuthRequest):
     memory_store.sessions[session_id] = {
         "token": token,
         "merchant_id": merchant_id,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
+    memory_store.tokens[token] = {"merchant_id": merchant_id, "session_id": session_id}
 
-    logger.info(f"Session created for merchant {merchant_id} with session_id {session_id}")
+    logger.info("Session created for merchant %s with session_id %s", merchant_id, session_id)
 
-    merchant = memory_store.merchants.get(merchant_id)
-    if not merchant:
-        logger.error(f"Merchant {merchant_id} not found during auth")
+    if merchant_id not in memory_store.merchants:
+        logger.error("Merchant %s not found during auth", merchant_id)
         raise HTTPException(status_code=404, detail="Merchant not found")
 
-    return AuthResponse(token=token, merchant=merchant)
+    # Only the token varies per call; splice it next to the pre-encoded merchant
+    body = b'{"token":' + orjson.dumps(token) + b',"merchant":' + memory_store.merchant_json(merchant_id) + b'}'
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/dashboard")
 async def get_dashboard(merchant_id: str = Depends(get_current_merchant)):
     """Get dashboard analytics data"""
-    # Calculate dashboard metrics from orders
-    merchant_orders = [o for o in memory_store.orders.values() if o["merchant_id"] == merchant_id]
-    today = datetime.now().date()
+    # Calculate dashboard metrics from orders in a single pass
+    orders = memory_store.orders
+    order_dates = memory_store.order_dates
+    today = datetime.now(timezone.utc).date()
     
-    # Today's orders
-    orders_today = len([o for o in merchant_orders if datetime.fromisoformat(o["created_at"].replace('Z', '+00:00')).date() == today])
-    
-    # Today's revenue
-    revenue_today = sum([o["total_amount"] for o in merchant_orders if datetime.fromisoformat(o["created_at"].replace('Z', '+00:00')).date() == today])
+    orders_today = 0
+    revenue_today = 0
+    pending_orders = 0
+    for oid in memory_store.orders_by_merchant.get(merchant_id):
+        o = orders[oid]
+        if order_dates[oid] == today:
+            orders_today += 1
+            revenue_today += o["total_amount"]
+        if o["status"] == "pending":
+            pending_orders += 1
     
     # Active offers
-    merchant_offers = [o for o in memory_store.offers.values() if o["merchant_id"] == merchant_id and o["is_active"]]
-    active_offers = len(merchant_offers)
+    merchant_offers = map(memory_store.offers.__getitem__, memory_store.offers_by_merchant.get(merchant_id))
+    active_offers = sum(1 for o in merchant_offers if o["is_active"])
     
     # Low stock products
-    merchant_products = [p for p in memory_store.products.values() if p["merchant_id"] == merchant_id]
-    low_stock_products = len([p for p in merchant_products if any(v["stock_quantity"] < 10 for v in p["variants"])])
+    product_ids = memory_store.products_by_merchant.get(merchant_id)
+    merchant_products = map(memory_store.products.__getitem__, product_ids)
+    low_stock_products = sum(1 for p in merchant_products if any(v["stock_quantity"] < 10 for v in p["variants"]))
     
     # Top products (mock calculation)
     top_products = [
@@ -347,9 +647,9 @@ async def get_dashboard(merchant_id: str = Depends(get_current_merchant)):
     ]
     
     # Recent orders
-    recent_orders = sorted(merchant_orders, key=lambda x: x["created_at"], reverse=True)[:5]
     formatted_recent_orders = []
-    for order in recent_orders:
+    for oid in itertools.islice(memory_store.recent_orders(merchant_id), 5):
+        order = orders[oid]
         formatted_recent_orders.append({
             "order_id": order["order_id"],
             "customer": order["customer_name"],
@@ -358,80 +658,74 @@ async def get_dashboard(merchant_id: str = Depends(get_current_merchant)):
             "items": len(order["items"])
         })
     
-    return {
+    return ORJSONResponse({
         "orders_today": orders_today,
         "revenue_today": revenue_today,
         "active_offers": active_offers,
         "low_stock_products": low_stock_products,
-        "total_products": len(merchant_products),
-        "pending_orders": len([o for o in merchant_orders if o["status"] == "pending"]),
+        "total_products": len(product_ids),
+        "pending_orders": pending_orders,
         "top_products": top_products,
         "recent_orders": formatted_recent_orders
-    }
+    })
 
 @app.get("/merchants/profile")
 async def get_merchant_profile(merchant_id: str = Depends(get_current_merchant)):
     """Get merchant profile information"""
-    merchant = memory_store.merchants.get(merchant_id)
-    if not merchant:
-        raise HTTPException(status_code=404, detail="Merchant not found")
-    return merchant
+    return _get_or_404(memory_store.merchants, merchant_id, "Merchant")
 
-@app.put("/merchants/profile")
-async def update_merchant_profile(profile_data: Dict[str, Any], merchant_id: str = Depends(get_current_merchant)):
+@app.put("/merchants/profile", openapi_extra=body_schema(ProfileUpdate))
+async def update_merchant_profile(merchant_id: str = Depends(get_current_merchant), profile_data: ProfileUpdate = json_body(ProfileUpdate)):
     """Update merchant profile information"""
-    if merchant_id not in memory_store.merchants:
-        raise HTTPException(status_code=404, detail="Merchant not found")
+    merchant = _get_or_404(memory_store.merchants, merchant_id, "Merchant")
     
     # Update merchant data
-    memory_store.merchants[merchant_id].update(profile_data)
-    memory_store.merchants[merchant_id]["updated_at"] = datetime.now().isoformat()
+    merchant.update(profile_data.model_dump(exclude_unset=True))
+    merchant["updated_at"] = now_iso()
+    memory_store.merchant_changed(merchant_id)
     
-    return memory_store.merchants[merchant_id]
+    return merchant
 
 @app.get("/merchants/shop-status")
 async def get_shop_status(merchant_id: str = Depends(get_current_merchant)):
     """Get shop operational status"""
-    merchant = memory_store.merchants.get(merchant_id)
-    if not merchant:
-        raise HTTPException(status_code=404, detail="Merchant not found")
-    return merchant["shop_status"]
+    return _get_or_404(memory_store.merchants, merchant_id, "Merchant")["shop_status"]
 
-@app.put("/merchants/shop-status")
-async def update_shop_status(status_data: ShopStatusUpdate, merchant_id: str = Depends(get_current_merchant)):
+@app.put("/merchants/shop-status", openapi_extra=body_schema(ShopStatusUpdate))
+async def update_shop_status(merchant_id: str = Depends(get_current_merchant), status_data: ShopStatusUpdate = json_body(ShopStatusUpdate)):
     """Update shop operational status"""
-    if merchant_id not in memory_store.merchants:
-        raise HTTPException(status_code=404, detail="Merchant not found")
-    
-    memory_store.merchants[merchant_id]["shop_status"] = status_data.dict()
-    return memory_store.merchants[merchant_id]["shop_status"]
+    merchant = _get_or_404(memory_store.merchants, merchant_id, "Merchant")
+    merchant["shop_status"] = dict(status_data.__dict__)
+    memory_store.merchant_changed(merchant_id)
+    return merchant["shop_status"]
 
 @app.get("/products")
 async def get_products(merchant_id: str = Depends(get_current_merchant), category: Optional[str] = None):
     """Get merchant's products with optional category filter"""
-    merchant_products = [p for p in memory_store.products.values() if p["merchant_id"] == merchant_id]
+    def build():
+        merchant_products = [memory_store.products[pid] for pid in memory_store.products_by_merchant.get(merchant_id)]
+        if category:
+            merchant_products = [p for p in merchant_products if p["category"] == category]
+        return merchant_products
     
-    if category:
-        merchant_products = [p for p in merchant_products if p["category"] == category]
-    
-    return merchant_products
+    return memory_store.cached_json(("products", "merchant", merchant_id, category), build)
 
-@app.post("/products")
-async def create_product(product_data: ProductCreate, merchant_id: str = Depends(get_current_merchant)):
+@app.post("/products", openapi_extra=body_schema(ProductCreate))
+async def create_product(merchant_id: str = Depends(get_current_merchant), product_data: ProductCreate = json_body(ProductCreate)):
     """Create a new product"""
-    product_id = f"prod_{uuid.uuid4().hex[:8]}"
+    product_id = mkid("prod")
     
     new_product = {
         "product_id": product_id,
         "merchant_id": merchant_id,
-        **product_data.dict(),
+        **product_data.__dict__,
         "is_active": True,
-        "created_at": datetime.now().isoformat(),
+        "created_at": now_iso(),
         "offers": []
     }
     
-    memory_store.products[product_id] = new_product
-    return new_product
+    memory_store.insert("products", product_id, new_product)
+    return ORJSONResponse(new_product)
 
 @app.get("/products/{product_id}")
 async def get_product(product_id: str, merchant_id: str = Depends(get_current_merchant)):
@@ -441,311 +735,287 @@ async def get_product(product_id: str, merchant_id: str = Depends(get_current_me
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
-@app.put("/products/{product_id}")
-async def update_product(product_id: str, product_data: Dict[str, Any], merchant_id: str = Depends(get_current_merchant)):
+@app.put("/products/{product_id}", openapi_extra=body_schema(ProductUpdate))
+async def update_product(product_id: str, merchant_id: str = Depends(get_current_merchant), product_data: ProductUpdate = json_body(ProductUpdate)):
     """Update product information"""
-    if product_id not in memory_store.products:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    product = memory_store.products[product_id]
+    product = _get_or_404(memory_store.products, product_id, "Product")
     if product["merchant_id"] != merchant_id:
         raise HTTPException(status_code=403, detail="Not authorized to update this product")
     
-    memory_store.products[product_id].update(product_data)
-    memory_store.products[product_id]["updated_at"] = datetime.now().isoformat()
-    
-    return memory_store.products[product_id]
+    return memory_store.update("products", product_id, {**product_data.model_dump(exclude_unset=True), "updated_at": now_iso()})
 
 @app.delete("/products/{product_id}")
 async def delete_product(product_id: str, merchant_id: str = Depends(get_current_merchant)):
     """Delete a product"""
-    if product_id not in memory_store.products:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    product = memory_store.products[product_id]
+    product = _get_or_404(memory_store.products, product_id, "Product")
     if product["merchant_id"] != merchant_id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this product")
     
-    del memory_store.products[product_id]
+    memory_store.delete("products", product_id)
     return {"message": "Product deleted successfully"}
 
 @app.get("/orders")
 async def get_orders(merchant_id: str = Depends(get_current_merchant), status: Optional[str] = None):
     """Get merchant's orders with optional status filter"""
-    merchant_orders = [o for o in memory_store.orders.values() if o["merchant_id"] == merchant_id]
+    # Already sorted by creation date (newest first)
+    merchant_orders = [memory_store.orders[oid] for oid in memory_store.recent_orders(merchant_id)]
     
     if status:
         merchant_orders = [o for o in merchant_orders if o["status"] == status]
     
-    # Sort by creation date (newest first)
-    merchant_orders.sort(key=lambda x: x["created_at"], reverse=True)
-    return merchant_orders
+    return ORJSONResponse(merchant_orders)
 
-@app.put("/orders/{order_id}/status")
-async def update_order_status(order_id: str, status_data: OrderStatusUpdate, merchant_id: str = Depends(get_current_merchant)):
+@app.put("/orders/{order_id}/status", openapi_extra=body_schema(OrderStatusUpdate))
+async def update_order_status(order_id: str, merchant_id: str = Depends(get_current_merchant), status_data: OrderStatusUpdate = json_body(OrderStatusUpdate)):
     """Update order status"""
-    if order_id not in memory_store.orders:
-        raise HTTPException(status_code=404, detail="Order not found")
-    
-    order = memory_store.orders[order_id]
+    order = _get_or_404(memory_store.orders, order_id, "Order")
     if order["merchant_id"] != merchant_id:
         raise HTTPException(status_code=403, detail="Not authorized to update this order")
     
-    memory_store.orders[order_id]["status"] = status_data.status
-    memory_store.orders[order_id]["updated_at"] = datetime.now().isoformat()
+    order["status"] = status_data.status
+    order["updated_at"] = now_iso()
     
-    return memory_store.orders[order_id]
+    return order
 
 @app.get("/offers")
 async def get_offers(merchant_id: str = Depends(get_current_merchant)):
     """Get merchant's offers"""
-    merchant_offers = [o for o in memory_store.offers.values() if o["merchant_id"] == merchant_id]
-    return merchant_offers
+    return memory_store.cached_json(
+        ("offers", "merchant", merchant_id),
+        lambda: [memory_store.offers[oid] for oid in memory_store.offers_by_merchant.get(merchant_id)]
+    )
 
-@app.post("/offers")
-async def create_offer(offer_data: OfferCreate, merchant_id: str = Depends(get_current_merchant)):
+@app.post("/offers", openapi_extra=body_schema(OfferCreate))
+async def create_offer(merchant_id: str = Depends(get_current_merchant), offer_data: OfferCreate = json_body(OfferCreate)):
     """Create a new offer (supports product-level offers)"""
-    offer_id = f"off_{uuid.uuid4().hex[:8]}"
+    offer_id = mkid("off")
     new_offer = {
         "offer_id": offer_id,
         "merchant_id": merchant_id,
-        **offer_data.dict(),
+        **offer_data.__dict__,
         "is_active": True,
         "usage_count": 0,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
-    memory_store.offers[offer_id] = new_offer
+    memory_store.insert("offers", offer_id, new_offer)
     # Attach offer to products if product_ids specified
     for pid in offer_data.product_ids:
         if pid in memory_store.products:
-            memory_store.products[pid].setdefault("offers", []).append(offer_id)
-    return new_offer
+            memory_store.products[pid]["offers"].append(offer_id)
+    memory_store.changed("products")
+    return ORJSONResponse(new_offer)
 
-@app.put("/offers/{offer_id}")
-async def update_offer(offer_id: str, offer_data: Dict[str, Any], merchant_id: str = Depends(get_current_merchant)):
+@app.put("/offers/{offer_id}", openapi_extra=body_schema(OfferUpdate))
+async def update_offer(offer_id: str, merchant_id: str = Depends(get_current_merchant), offer_data: OfferUpdate = json_body(OfferUpdate)):
     """Update offer information"""
-    if offer_id not in memory_store.offers:
-        raise HTTPException(status_code=404, detail="Offer not found")
-    
-    offer = memory_store.offers[offer_id]
+    offer = _get_or_404(memory_store.offers, offer_id, "Offer")
     if offer["merchant_id"] != merchant_id:
         raise HTTPException(status_code=403, detail="Not authorized to update this offer")
     
-    memory_store.offers[offer_id].update(offer_data)
-    memory_store.offers[offer_id]["updated_at"] = datetime.now().isoformat()
-    
-    return memory_store.offers[offer_id]
+    return ORJSONResponse(memory_store.update("offers", offer_id, {**offer_data.model_dump(exclude_unset=True), "updated_at": now_iso()}))
 
 @app.delete("/offers/{offer_id}")
 async def delete_offer(offer_id: str, merchant_id: str = Depends(get_current_merchant)):
     """Delete an offer"""
-    if offer_id not in memory_store.offers:
-        raise HTTPException(status_code=404, detail="Offer not found")
-    
-    offer = memory_store.offers[offer_id]
+    offer = _get_or_404(memory_store.offers, offer_id, "Offer")
     if offer["merchant_id"] != merchant_id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this offer")
     
-    del memory_store.offers[offer_id]
+    memory_store.delete("offers", offer_id)
     return {"message": "Offer deleted successfully"}
 
 # In-memory reviews store
 if not hasattr(memory_store, "reviews"):
     memory_store.reviews = {}
 
-def get_current_customer(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
-    token = credentials.credentials
+def _customer_for_token(token: str) -> str:
+    """Extract customer ID from JWT token (simplified for demo)"""
     # For demo, accept any token and return customer123
     if token and token.startswith(("mock", "demo")):
         return "customer123"
     # Real implementation: decode JWT and extract customer_id
-    for session_id, session_data in memory_store.sessions.items():
-        if session_data.get("token") == token:
-            return session_data.get("customer_id", "customer123")
+    session_data = memory_store.tokens.get(token)
+    if session_data:
+        return session_data.get("customer_id", "customer123")
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
 
-@app.post("/reviews")
-async def add_review(review: ReviewCreate = Body(...), customer_id: str = Depends(get_current_customer)):
+get_current_customer = BearerAuth(_customer_for_token)
+
+@app.post("/reviews", openapi_extra=body_schema(ReviewCreate))
+async def add_review(customer_id: str = Depends(get_current_customer), review: ReviewCreate = json_body(ReviewCreate)):
     """Add a review for a product or shop (customer only)"""
-    review_id = f"rev_{uuid.uuid4().hex[:8]}"
-    review_dict = review.dict()
+    review_id = mkid("rev")
+    # Body models hold only JSON-native values, so a plain field copy
+    # replaces the recursive dict() conversion
+    review_dict = dict(review.__dict__)
     review_dict["review_id"] = review_id
     review_dict["customer_id"] = customer_id
-    review_dict["created_at"] = datetime.now().isoformat()
+    review_dict["created_at"] = now_iso()
     review_dict["is_verified"] = True
     review_dict["is_approved"] = True
-    memory_store.reviews[review_id] = review_dict
+    memory_store.insert("reviews", review_id, review_dict)
     # Update product/shop review stats
     if review.product_id and review.product_id in memory_store.products:
-        p = memory_store.products[review.product_id]
-        p["total_reviews"] = p.get("total_reviews", 0) + 1
-        p["rating"] = round(((p.get("rating", 0) * (p["total_reviews"] - 1)) + review.rating) / p["total_reviews"], 2)
+        memory_store.add_rating("products", review.product_id, memory_store.products[review.product_id], review.rating)
+        memory_store.changed("products")
     if review.shop_id and review.shop_id in memory_store.merchants:
-        s = memory_store.merchants[review.shop_id]
-        s["total_reviews"] = s.get("total_reviews", 0) + 1
-        s["rating"] = round(((s.get("rating", 0) * (s["total_reviews"] - 1)) + review.rating) / s["total_reviews"], 2)
-    return review_dict
+        memory_store.add_rating("merchants", review.shop_id, memory_store.merchants[review.shop_id], review.rating)
+        memory_store.merchant_changed(review.shop_id)
+    return ORJSONResponse(review_dict)
 
 @app.get("/reviews")
 async def get_reviews(product_id: Optional[str] = None, shop_id: Optional[str] = None):
     """List reviews for a product or shop"""
-    reviews = list(memory_store.reviews.values())
-    if product_id:
-        reviews = [r for r in reviews if r.get("product_id") == product_id]
-    if shop_id:
-        reviews = [r for r in reviews if r.get("shop_id") == shop_id]
-    return reviews
+    def build():
+        if product_id:
+            review_ids = memory_store.reviews_by_product.get(product_id)
+            if shop_id:
+                shop_review_ids = memory_store.reviews_by_shop.get(shop_id)
+                review_ids = [rid for rid in review_ids if rid in shop_review_ids]
+        elif shop_id:
+            review_ids = memory_store.reviews_by_shop.get(shop_id)
+        else:
+            review_ids = memory_store.reviews
+        return [memory_store.reviews[rid] for rid in review_ids]
+    
+    return memory_store.cached_json(("reviews", "query", product_id, shop_id), build)
 
 @app.get("/products/{product_id}/reviews")
 async def get_product_reviews(product_id: str):
     """List reviews for a product"""
-    return [r for r in memory_store.reviews.values() if r.get("product_id") == product_id]
+    return memory_store.cached_json(
+        ("reviews", "product", product_id),
+        lambda: [memory_store.reviews[rid] for rid in memory_store.reviews_by_product.get(product_id)]
+    )
 
 @app.get("/shops/{shop_id}/reviews")
 async def get_shop_reviews(shop_id: str):
     """List reviews for a shop"""
-    return [r for r in memory_store.reviews.values() if r.get("shop_id") == shop_id]
+    return memory_store.cached_json(
+        ("reviews", "shop", shop_id),
+        lambda: [memory_store.reviews[rid] for rid in memory_store.reviews_by_shop.get(shop_id)]
+    )
 
 @app.get("/products/{product_id}/offers")
 async def get_product_offers(product_id: str):
     """List offers for a product"""
-    return [o for o in memory_store.offers.values() if o.get("level") == "product" and product_id in o.get("product_ids", []) and o.get("is_active")]
+    return memory_store.cached_json(
+        ("offers", "product", product_id),
+        lambda: [memory_store.offers[oid] for oid in memory_store.active_product_offers.get(product_id)]
+    )
 
 @app.get("/shops/{shop_id}/offers")
 async def get_shop_offers(shop_id: str):
     """List offers for a shop (global shop offers)"""
-    return [o for o in memory_store.offers.values() if o.get("level") == "merchant" and o.get("merchant_id") == shop_id and o.get("is_active")]
+    return memory_store.cached_json(
+        ("offers", "shop", shop_id),
+        lambda: [memory_store.offers[oid] for oid in memory_store.active_merchant_offers.get(shop_id)]
+    )
 
-@app.post("/products/{product_id}/reviews")
-async def add_product_review(product_id: str, review: ReviewCreate):
-    review_id = f"rev_{uuid.uuid4().hex[:8]}"
-    review_dict = review.dict()
+@app.post("/products/{product_id}/reviews", openapi_extra=body_schema(ReviewCreate))
+async def add_product_review(product_id: str, review: ReviewCreate = json_body(ReviewCreate)):
+    review_id = mkid("rev")
+    review_dict = dict(review.__dict__)
     review_dict["review_id"] = review_id
     review_dict["product_id"] = product_id
-    review_dict["created_at"] = datetime.now().isoformat()
-    memory_store.reviews[review_id] = review_dict
-    return review_dict
-
-@app.put("/products/{product_id}/reviews/{review_id}")
-async def update_product_review(product_id: str, review_id: str, review: ReviewCreate):
-    if review_id not in memory_store.reviews:
-        raise HTTPException(status_code=404, detail="Review not found")
-    memory_store.reviews[review_id].update(review.dict())
-    memory_store.reviews[review_id]["updated_at"] = datetime.now().isoformat()
-    return memory_store.reviews[review_id]
+    review_dict["created_at"] = now_iso()
+    memory_store.insert("reviews", review_id, review_dict)
+    return ORJSONResponse(review_dict)
+
+@app.put("/products/{product_id}/reviews/{review_id}", openapi_extra=body_schema(ReviewCreate))
+async def update_product_review(product_id: str, review_id: str, review: ReviewCreate = json_body(ReviewCreate)):
+    _get_or_404(memory_store.reviews, review_id, "Review")
+    return ORJSONResponse(memory_store.update("reviews", review_id, {**review.__dict__, "updated_at": now_iso()}))
 
 @app.delete("/products/{product_id}/reviews/{review_id}")
 async def delete_product_review(product_id: str, review_id: str):
-    if review_id not in memory_store.reviews:
-        raise HTTPException(status_code=404, detail="Review not found")
-    del memory_store.reviews[review_id]
+    _get_or_404(memory_store.reviews, review_id, "Review")
+    memory_store.delete("reviews", review_id)
     return {"message": "Review deleted"}
 
-@app.post("/shops/{shop_id}/reviews")
-async def add_shop_review(shop_id: str, review: ReviewCreate):
-    review_id = f"rev_{uuid.uuid4().hex[:8]}"
-    review_dict = review.dict()
+@app.post("/shops/{shop_id}/reviews", openapi_extra=body_schema(ReviewCreate))
+async def add_shop_review(shop_id: str, review: ReviewCreate = json_body(ReviewCreate)):
+    review_id = mkid("rev")
+    review_dict = dict(review.__dict__)
     review_dict["review_id"] = review_id
     review_dict["shop_id"] = shop_id
-    review_dict["created_at"] = datetime.now().isoformat()
-    memory_store.reviews[review_id] = review_dict
-    return review_dict
-
-@app.put("/shops/{shop_id}/reviews/{review_id}")
-async def update_shop_review(shop_id: str, review_id: str, review: ReviewCreate):
-    if review_id not in memory_store.reviews:
-        raise HTTPException(status_code=404, detail="Review not found")
-    memory_store.reviews[review_id].update(review.dict())
-    memory_store.reviews[review_id]["updated_at"] = datetime.now().isoformat()
-    return memory_store.reviews[review_id]
+    review_dict["created_at"] = now_iso()
+    memory_store.insert("reviews", review_id, review_dict)
+    return ORJSONResponse(review_dict)
+
+@app.put("/shops/{shop_id}/reviews/{review_id}", openapi_extra=body_schema(ReviewCreate))
+async def update_shop_review(shop_id: str, review_id: str, review: ReviewCreate = json_body(ReviewCreate)):
+    _get_or_404(memory_store.reviews, review_id, "Review")
+    return ORJSONResponse(memory_store.update("reviews", review_id, {**review.__dict__, "updated_at": now_iso()}))
 
 @app.delete("/shops/{shop_id}/reviews/{review_id}")
 async def delete_shop_review(shop_id: str, review_id: str):
-    if review_id not in memory_store.reviews:
-        raise HTTPException(status_code=404, detail="Review not found")
-    del memory_store.reviews[review_id]
+    _get_or_404(memory_store.reviews, review_id, "Review")
+    memory_store.delete("reviews", review_id)
     return {"message": "Review deleted"}
 
-@app.post("/products/{product_id}/offers")
-async def add_product_offer(product_id: str, offer: OfferCreate):
-    offer_id = f"off_{uuid.uuid4().hex[:8]}"
-    offer_dict = offer.dict()
+@app.post("/products/{product_id}/offers", openapi_extra=body_schema(OfferCreate))
+async def add_product_offer(product_id: str, offer: OfferCreate = json_body(OfferCreate)):
+    offer_id = mkid("off")
+    offer_dict = dict(offer.__dict__)
     offer_dict["offer_id"] = offer_id
     offer_dict["level"] = "product"
     offer_dict["product_ids"] = [product_id]
     offer_dict["is_active"] = True
-    offer_dict["created_at"] = datetime.now().isoformat()
-    memory_store.offers[offer_id] = offer_dict
-    return offer_dict
-
-@app.put("/products/{product_id}/offers/{offer_id}")
-async def update_product_offer(product_id: str, offer_id: str, offer: OfferCreate):
-    if offer_id not in memory_store.offers:
-        raise HTTPException(status_code=404, detail="Offer not found")
-    memory_store.offers[offer_id].update(offer.dict())
-    memory_store.offers[offer_id]["updated_at"] = datetime.now().isoformat()
-    return memory_store.offers[offer_id]
+    offer_dict["created_at"] = now_iso()
+    memory_store.insert("offers", offer_id, offer_dict)
+    return ORJSONResponse(offer_dict)
+
+@app.put("/products/{product_id}/offers/{offer_id}", openapi_extra=body_schema(OfferCreate))
+async def update_product_offer(product_id: str, offer_id: str, offer: OfferCreate = json_body(OfferCreate)):
+    _get_or_404(memory_store.offers, offer_id, "Offer")
+    return ORJSONResponse(memory_store.update("offers", offer_id, {**offer.__dict__, "updated_at": now_iso()}))
 
 @app.delete("/products/{product_id}/offers/{offer_id}")
 async def delete_product_offer(product_id: str, offer_id: str):
-    if offer_id not in memory_store.offers:
-        raise HTTPException(status_code=404, detail="Offer not found")
-    del memory_store.offers[offer_id]
+    _get_or_404(memory_store.offers, offer_id, "Offer")
+    memory_store.delete("offers", offer_id)
     return {"message": "Offer deleted"}
 
-@app.post("/shops/{shop_id}/offers")
-async def add_shop_offer(shop_id: str, offer: OfferCreate):
-    offer_id = f"off_{uuid.uuid4().hex[:8]}"
-    offer_dict = offer.dict()
+@app.post("/shops/{shop_id}/offers", openapi_extra=body_schema(OfferCreate))
+async def add_shop_offer(shop_id: str, offer: OfferCreate = json_body(OfferCreate)):
+    offer_id = mkid("off")
+    offer_dict = dict(offer.__dict__)
     offer_dict["offer_id"] = offer_id
     offer_dict["level"] = "merchant"
     offer_dict["merchant_id"] = shop_id
     offer_dict["is_active"] = True
-    offer_dict["created_at"] = datetime.now().isoformat()
-    memory_store.offers[offer_id] = offer_dict
-    return offer_dict
-
-@app.put("/shops/{shop_id}/offers/{offer_id}")
-async def update_shop_offer(shop_id: str, offer_id: str, offer: OfferCreate):
-    if offer_id not in memory_store.offers:
-        raise HTTPException(status_code=404, detail="Offer not found")
-    memory_store.offers[offer_id].update(offer.dict())
-    memory_store.offers[offer_id]["updated_at"] = datetime.now().isoformat()
-    return memory_store.offers[offer_id]
+    offer_dict["created_at"] = now_iso()
+    memory_store.insert("offers", offer_id, offer_dict)
+    return ORJSONResponse(offer_dict)
+
+@app.put("/shops/{shop_id}/offers/{offer_id}", openapi_extra=body_schema(OfferCreate))
+async def update_shop_offer(shop_id: str, offer_id: str, offer: OfferCreate = json_body(OfferCreate)):
+    _get_or_404(memory_store.offers, offer_id, "Offer")
+    return ORJSONResponse(memory_store.update("offers", offer_id, {**offer.__dict__, "updated_at": now_iso()}))
 
 @app.delete("/shops/{shop_id}/offers/{offer_id}")
 async def delete_shop_offer(shop_id: str, offer_id: str):
-    if offer_id not in memory_store.offers:
-        raise HTTPException(status_code=404, detail="Offer not found")
-    del memory_store.offers[offer_id]
+    _get_or_404(memory_store.offers, offer_id, "Offer")
+    memory_store.delete("offers", offer_id)
     return {"message": "Offer deleted"}
 
-@app.post("/orders")
-async def create_order(order: Dict[str, Any]):
-    shop_id = order.get("shop_id")
-    merchant = None
-    # Find merchant by shop_id
-    for m in memory_store.merchants.values():
-        if m.get("merchant_id") == shop_id or m.get("shop_id") == shop_id:
-            merchant = m
-            break
+@app.post("/orders", openapi_extra=body_schema(OrderCreate))
+async def create_order(order: OrderCreate = json_body(OrderCreate)):
+    shop_id = order.shop_id
+    merchant = memory_store.shop_index.get(shop_id)
     if not merchant:
         raise HTTPException(status_code=404, detail="Shop not found")
     if not merchant.get("shop_status", {}).get("is_open", True):
         raise HTTPException(status_code=400, detail="Shop is currently closed and cannot accept orders.")
-    order_id = f"ORD_{uuid.uuid4().hex[:8]}"
-    new_order = {"order_id": order_id, **order, "status": "pending", "created_at": datetime.now().isoformat()}
-    memory_store.orders[order_id] = new_order
-    return new_order
+    order_id = mkid("ORD")
+    new_order = {"order_id": order_id, **order.model_dump(exclude_unset=True), "status": "pending", "created_at": now_iso()}
+    memory_store.add_order(new_order)
+    return ORJSONResponse(new_order)
 
 @app.put("/shops/{shop_id}/status")
 async def update_shop_open_status(shop_id: str, status: Dict[str, Any]):
-    # Find merchant by shop_id
-    merchant = None
-    for m in memory_store.merchants.values():
-        if m.get("merchant_id") == shop_id or m.get("shop_id") == shop_id:
-            merchant = m
-            break
+    merchant = memory_store.shop_index.get(shop_id)
     if not merchant:
         raise HTTPException(status_code=404, detail="Shop not found")
     if "shop_status" not in merchant:
@@ -754,10 +1024,12 @@ async def update_shop_open_status(shop_id: str, status: Dict[str, Any]):
         merchant["shop_status"]["is_open"] = status["is_open"]
     else:
         raise HTTPException(status_code=400, detail="Missing 'is_open' in request body.")
-    merchant["shop_status"]["updated_at"] = datetime.now().isoformat()
+    merchant["shop_status"]["updated_at"] = now_iso()
+    memory_store.merchant_changed(merchant["merchant_id"])
     return {"shop_id": shop_id, "is_open": merchant["shop_status"]["is_open"]}
 
 # Run the application
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001, reload=True)
+    # Single worker: every process would get its own in-memory store
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="uvloop", http="httptools")
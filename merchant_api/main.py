@@ -2,53 +2,94 @@
 Merchant API - FastAPI backend for merchant app
 """
 from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Dict, Optional, Any
-from datetime import datetime
+import asyncio
+import time
 import uuid
 import logging
+import os
 
+from shared.auth.bearer import bearer_token
 from shared.auth.google_auth import google_auth_service
+from shared.cache.redis_cache import cache_service, APPROVED_SHOPS_PREFIX
 from shared.database.dynamodb import db_service
 from shared.models.base import (
     BaseUser, Shop, Product, Order, Review, 
     UserRole, OrderStatus, ShopStatus
 )
+from shared.utils.clock import now_iso
+from shared.utils.cors import add_cors
+from shared.utils.ids import new_uuids
+from shared.utils.logging_config import configure_logging
+from shared.utils.profiling import add_profiling
+from shared.utils.streaming import stream_json_list
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Enum value as a plain string, compared against what DynamoDB returns
+_MERCHANT = UserRole.MERCHANT.value
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Merchant API",
     description="Backend API for Merchant App",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+add_cors(app)
+
+# Profile single requests with ?profile=1 when PROFILING=true
+add_profiling(app)
+
+# Logging is configured per worker on startup, not at import time
+@app.on_event("startup")
+async def startup_logging():
+    """Start the background log listener"""
+    app.state.log_listener = configure_logging()
+
+@app.on_event("shutdown")
+async def shutdown_logging():
+    """Flush and stop the background log listener"""
+    app.state.log_listener.stop()
+
+@app.on_event("startup")
+async def startup_google_client():
+    """Open the pooled client for Google token checks"""
+    await google_auth_service.open()
 
-# Security
-security = HTTPBearer()
+@app.on_event("shutdown")
+async def shutdown_google_client():
+    """Close the pooled client for Google token checks"""
+    await google_auth_service.close()
+
+@app.on_event("startup")
+async def startup_eviction_listener():
+    """Drop cached items written by other processes"""
+    app.state.eviction_listener = asyncio.create_task(db_service.listen_for_evictions())
+
+@app.on_event("shutdown")
+async def shutdown_eviction_listener():
+    """Stop listening for evictions"""
+    app.state.eviction_listener.cancel()
+
+@app.on_event("shutdown")
+async def shutdown_db():
+    """Close the process's shared DynamoDB client"""
+    await db_service.close()
 
 # Dependency to get current merchant
-async def get_current_merchant(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+async def get_current_merchant(token: str = Depends(bearer_token)) -> Dict:
     """Get current authenticated merchant"""
     try:
-        user_data = google_auth_service.verify_jwt_token(credentials.credentials)
+        user_data = google_auth_service.verify_jwt_token(token)
         user = await db_service.get_user(user_data["user_id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        if user["role"] != UserRole.MERCHANT:
+        if user["role"] != _MERCHANT:
             raise HTTPException(status_code=403, detail="Access denied. Merchant role required.")
         
         return user
@@ -56,7 +97,7 @@ async def get_current_merchant(credentials: HTTPAuthorizationCredentials = Depen
         raise HTTPException(status_code=401, detail="Invalid authentication")
 
 # Pydantic models for requests
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class GoogleAuthRequest(BaseModel):
     access_token: str
@@ -126,12 +167,15 @@ class ProductCreate(BaseModel):
     images: List[str] = []
     variants: List[ProductVariantCreate]
 
+class ProductBulkCreate(BaseModel):
+    products: List[ProductCreate] = Field(..., min_length=1, max_length=500)
+
 class OrderStatusUpdate(BaseModel):
     status: OrderStatus
     merchant_notes: Optional[str] = None
 
 # Authentication routes
-@app.post("/auth/google", response_model=AuthResponse)
+@app.post("/auth/google", responses={200: {"model": AuthResponse}})
 async def google_auth(auth_request: GoogleAuthRequest):
     """Authenticate merchant with Google OAuth"""
     try:
@@ -144,17 +188,18 @@ async def google_auth(auth_request: GoogleAuthRequest):
             auth_result["user"]["role"] = UserRole.MERCHANT
             user_model = BaseUser(**auth_result["user"])
             user = await db_service.create_user(user_model)
-        elif user["role"] != UserRole.MERCHANT:
-            # Update role to merchant if needed
+        elif user["role"] != _MERCHANT:
+            # Update role to merchant if needed; awaited so the next request sees it
             await db_service.update_user(user["user_id"], {"role": UserRole.MERCHANT})
             user["role"] = UserRole.MERCHANT
         
-        return AuthResponse(
-            token=auth_result["token"],
-            user=user
-        )
+        # Documented as AuthResponse but returned as-is, skipping response validation
+        return {
+            "token": auth_result["token"],
+            "user": user
+        }
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         raise HTTPException(status_code=401, detail="Authentication failed")
 
 # Dashboard routes
@@ -167,33 +212,21 @@ async def get_dashboard(current_merchant: Dict = Depends(get_current_merchant)):
         # Get merchant's shops
         shops = await db_service.get_shops_by_merchant(merchant_id)
         
-        # Get recent orders across all shops
-        all_orders = []
-        for shop in shops:
-            shop_orders = await db_service.get_orders_by_shop(shop["shop_id"])
-            all_orders.extend(shop_orders)
-        
-        # Sort orders by creation date
-        all_orders.sort(key=lambda x: x["created_at"], reverse=True)
-        recent_orders = all_orders[:10]  # Last 10 orders
-        
-        # Calculate statistics
-        total_orders = len(all_orders)
-        pending_orders = len([o for o in all_orders if o["status"] == OrderStatus.PENDING])
-        total_revenue = sum(o["total_amount"] for o in all_orders if o["status"] == OrderStatus.DELIVERED)
+        # Counters and the last 10 orders come from the per-shop stats
+        # items and the created_at index, so cost does not grow with history
+        shop_ids = [shop["shop_id"] for shop in shops]
+        statistics, recent_orders = await asyncio.gather(
+            db_service.get_shops_stats(shop_ids),
+            db_service.get_recent_orders_by_shops(shop_ids, 10)
+        )
         
         return {
             "shops": shops,
             "recent_orders": recent_orders,
-            "statistics": {
-                "total_orders": total_orders,
-                "pending_orders": pending_orders,
-                "total_revenue": total_revenue,
-                "total_shops": len(shops)
-            }
+            "statistics": {**statistics, "total_shops": len(shops)}
         }
     except Exception as e:
-        logger.error(f"Error fetching dashboard: {str(e)}")
+        logger.error("Error fetching dashboard: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch dashboard")
 
 # Shop routes
@@ -204,7 +237,7 @@ async def get_merchant_shops(current_merchant: Dict = Depends(get_current_mercha
         shops = await db_service.get_shops_by_merchant(current_merchant["user_id"])
         return {"shops": shops}
     except Exception as e:
-        logger.error(f"Error fetching shops: {str(e)}")
+        logger.error("Error fetching shops: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch shops")
 
 @app.post("/shops")
@@ -217,13 +250,13 @@ async def create_shop(
         shop = Shop(
             shop_id=str(uuid.uuid4()),
             merchant_id=current_merchant["user_id"],
-            **shop_data.dict()
+            **shop_data.model_dump()
         )
         
         created_shop = await db_service.create_shop(shop)
         return created_shop
     except Exception as e:
-        logger.error(f"Error creating shop: {str(e)}")
+        logger.error("Error creating shop: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create shop")
 
 @app.get("/shops/{shop_id}")
@@ -244,7 +277,7 @@ async def get_shop(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching shop: {str(e)}")
+        logger.error("Error fetching shop: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch shop")
 
 @app.put("/shops/{shop_id}")
@@ -255,21 +288,21 @@ async def update_shop(
 ):
     """Update shop details"""
     try:
-        # Verify shop ownership
-        shop = await db_service.get_shop(shop_id)
-        if not shop or shop["merchant_id"] != current_merchant["user_id"]:
+        updates = shop_data.model_dump(exclude_none=True)
+        updates["updated_at"] = now_iso()
+        if "name" in updates:
+            updates["name_lower"] = updates["name"].lower()
+        
+        # Ownership is checked by the conditional write itself
+        updated_shop = await db_service.update_shop_if_owner(shop_id, current_merchant["user_id"], updates)
+        if not updated_shop:
             raise HTTPException(status_code=404, detail="Shop not found")
-        
-        # Update shop
-        updates = {k: v for k, v in shop_data.dict().items() if v is not None}
-        updates["updated_at"] = datetime.utcnow()
-        
-        updated_shop = await db_service.update_shop(shop_id, updates)
+        await cache_service.delete_prefix(APPROVED_SHOPS_PREFIX)
         return updated_shop
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating shop: {str(e)}")
+        logger.error("Error updating shop: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update shop")
 
 @app.put("/shops/{shop_id}/status")
@@ -280,26 +313,25 @@ async def update_shop_status(
 ):
     """Update shop open/close status"""
     try:
-        # Verify shop ownership
-        shop = await db_service.get_shop(shop_id)
-        if not shop or shop["merchant_id"] != current_merchant["user_id"]:
-            raise HTTPException(status_code=404, detail="Shop not found")
-        
         updates = {
             "is_open": status_data.is_open,
             "accepting_orders": status_data.accepting_orders,
-            "updated_at": datetime.utcnow()
+            "updated_at": now_iso()
         }
         
         if status_data.reason:
             updates["status_reason"] = status_data.reason
         
-        updated_shop = await db_service.update_shop(shop_id, updates)
+        # Ownership is checked by the conditional write itself
+        updated_shop = await db_service.update_shop_if_owner(shop_id, current_merchant["user_id"], updates)
+        if not updated_shop:
+            raise HTTPException(status_code=404, detail="Shop not found")
+        await cache_service.delete_prefix(APPROVED_SHOPS_PREFIX)
         return updated_shop
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating shop status: {str(e)}")
+        logger.error("Error updating shop status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update shop status")
 
 # Product routes
@@ -320,7 +352,7 @@ async def get_shop_products(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching products: {str(e)}")
+        logger.error("Error fetching products: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch products")
 
 @app.post("/shops/{shop_id}/products")
@@ -336,20 +368,16 @@ async def create_product(
         if not shop or shop["merchant_id"] != current_merchant["user_id"]:
             raise HTTPException(status_code=404, detail="Shop not found")
         
-        # Convert variants
-        variants = []
-        for var_data in product_data.variants:
-            variant = {
-                "variant_id": str(uuid.uuid4()),
-                **var_data.dict()
-            }
-            variants.append(variant)
+        # One dump covers the nested variants too; they only need ids
+        data = product_data.model_dump()
+        product_id, *variant_ids = new_uuids(1 + len(data["variants"]))
+        for variant, variant_id in zip(data["variants"], variant_ids):
+            variant["variant_id"] = variant_id
         
         product = Product(
-            product_id=str(uuid.uuid4()),
+            product_id=product_id,
             shop_id=shop_id,
-            variants=variants,
-            **{k: v for k, v in product_data.dict().items() if k != "variants"}
+            **data
         )
         
         created_product = await db_service.create_product(product)
@@ -357,9 +385,38 @@ async def create_product(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating product: {str(e)}")
+        logger.error("Error creating product: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create product")
 
+@app.post("/shops/{shop_id}/products/bulk")
+async def bulk_create_products(
+    shop_id: str,
+    bulk_data: ProductBulkCreate,
+    current_merchant: Dict = Depends(get_current_merchant)
+):
+    """Create several products at once, e.g. from a catalogue import"""
+    try:
+        # Verify shop ownership
+        shop = await db_service.get_shop(shop_id)
+        if not shop or shop["merchant_id"] != current_merchant["user_id"]:
+            raise HTTPException(status_code=404, detail="Shop not found")
+        
+        payloads = [product_data.model_dump() for product_data in bulk_data.products]
+        ids = iter(new_uuids(sum(1 + len(data["variants"]) for data in payloads)))
+        products = []
+        for data in payloads:
+            for variant in data["variants"]:
+                variant["variant_id"] = next(ids)
+            products.append(Product(product_id=next(ids), shop_id=shop_id, **data))
+        
+        created_products = await db_service.bulk_create_products(products)
+        return {"products": created_products}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error bulk creating products: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to create products")
+
 @app.get("/products/{product_id}")
 async def get_product(
     product_id: str,
@@ -380,7 +437,7 @@ async def get_product(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching product: {str(e)}")
+        logger.error("Error fetching product: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch product")
 
 @app.put("/products/{product_id}")
@@ -403,13 +460,13 @@ async def update_product(
         # This would need to be implemented in the database service
         # For now, return the product with updates
         product.update(updates)
-        product["updated_at"] = datetime.utcnow()
+        product["updated_at"] = now_iso()
         
         return product
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating product: {str(e)}")
+        logger.error("Error updating product: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update product")
 
 # Order routes
@@ -426,12 +483,20 @@ async def get_shop_orders(
         if not shop or shop["merchant_id"] != current_merchant["user_id"]:
             raise HTTPException(status_code=404, detail="Shop not found")
         
-        orders = await db_service.get_orders_by_shop(shop_id, status)
-        return {"orders": orders}
+        orders, next_cursor = await db_service.get_orders_page_by_shop(shop_id, status)
+        
+        # Stream any further pages instead of collecting them first
+        return StreamingResponse(
+            stream_json_list(
+                "orders", orders, next_cursor,
+                lambda cursor: db_service.get_orders_page_by_shop(shop_id, status, cursor)
+            ),
+            media_type="application/json"
+        )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching orders: {str(e)}")
+        logger.error("Error fetching orders: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch orders")
 
 @app.put("/orders/{order_id}/status")
@@ -451,21 +516,17 @@ async def update_order_status(
         if not shop or shop["merchant_id"] != current_merchant["user_id"]:
             raise HTTPException(status_code=403, detail="Access denied")
         
-        # Update order status
-        updates = {
-            "status": status_data.status,
-            "updated_at": datetime.utcnow()
-        }
-        
-        if status_data.merchant_notes:
-            updates["merchant_notes"] = status_data.merchant_notes
-        
-        updated_order = await db_service.update_order_status(order_id, status_data.status)
+        # Apply the change only to the status the merchant saw; the notes and
+        # updated_at go in the same write
+        fields = {"merchant_notes": status_data.merchant_notes} if status_data.merchant_notes else None
+        updated_order = await db_service.update_order_status(order_id, status_data.status, order["status"], fields)
+        if updated_order is None:
+            raise HTTPException(status_code=409, detail="Order status has changed")
         return updated_order
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating order status: {str(e)}")
+        logger.error("Error updating order status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update order status")
 
 # Profile routes
@@ -489,9 +550,17 @@ async def update_profile(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002) 
\ No newline at end of file
+    # Multiple workers need the app as an import string
+    uvicorn.run(
+        "merchant_api.main:app",
+        host="0.0.0.0",
+        port=8002,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
@@ -0,0 +1,23 @@
+"""
+Bearer token dependency shared by the services
+"""
+from fastapi import HTTPException, Request, status
+from fastapi.security import HTTPBearer
+
+
+class BearerToken(HTTPBearer):
+    """HTTPBearer that reads the Authorization header once and returns the raw token"""
+
+    async def __call__(self, request: Request) -> str:
+        authorization = request.headers.get("authorization")
+        if not authorization or authorization[:7].lower() != "bearer ":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        return authorization[7:]
+
+
+# Subclassing HTTPBearer keeps the security scheme in the OpenAPI docs
+bearer_token = BearerToken()
@@ -2,27 +2,78 @@
 Google OAuth 2.0 authentication service
 """
 import os
+import time
+import asyncio
+import hashlib
 import jwt
-import requests
+import httpx
+from cachetools import TTLCache
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from shared.models.base import BaseUser, UserRole
 
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_HTTP_TIMEOUT = 5.0
+GOOGLE_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Google userinfo keyed by a digest of the access token. Access tokens live
+# for about an hour, so a few minutes of reuse stays well inside that
+_userinfo_cache = TTLCache(maxsize=10_000, ttl=300)
+# In-flight lookups, so concurrent logins with one token share a single call
+_userinfo_locks: Dict[bytes, asyncio.Lock] = {}
+# Verified JWT payloads keyed by a digest of the token; each entry is also
+# checked against the token's own exp so it never outlives the token
+_jwt_cache = TTLCache(maxsize=20_000, ttl=60)
 
 class GoogleAuthService:
     def __init__(self):
         self.google_client_id = os.getenv("GOOGLE_CLIENT_ID")
         self.jwt_secret = os.getenv("JWT_SECRET", "your-secret-key")
+        # Encoded once; PyJWT signs with hmac/hashlib (OpenSSL) given bytes
+        self._jwt_key = self.jwt_secret.encode()
         self.jwt_algorithm = "HS256"
         self.jwt_expiry_hours = 24
+        # Pooled client shared by all requests, opened on service startup
+        self._http_client: Optional[httpx.AsyncClient] = None
+    
+    async def open(self):
+        """Open the pooled HTTP client used to call Google"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=GOOGLE_HTTP_TIMEOUT, limits=GOOGLE_HTTP_LIMITS)
+    
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
         
     async def verify_google_token(self, access_token: str) -> Dict:
-        """Verify Google access token and get user info"""
+        """Verify Google access token and get user info, reusing recent results"""
+        key = hashlib.sha256(access_token.encode()).digest()
+        user_info = _userinfo_cache.get(key)
+        if user_info is not None:
+            return user_info
+        
+        lock = _userinfo_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                user_info = _userinfo_cache.get(key)
+                if user_info is None:
+                    user_info = await self._fetch_google_userinfo(access_token)
+                    _userinfo_cache[key] = user_info
+                return user_info
+            finally:
+                _userinfo_locks.pop(key, None)
+    
+    async def _fetch_google_userinfo(self, access_token: str) -> Dict:
+        """Call the Google userinfo endpoint for an access token"""
         try:
             # Verify token with Google
-            response = requests.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
+            if self._http_client is None:
+                await self.open()
+            response = await self._http_client.get(
+                GOOGLE_USERINFO_URL,
                 headers={"Authorization": f"Bearer {access_token}"}
             )
             
@@ -47,18 +98,28 @@ class GoogleAuthService:
             "user_id": user_data["user_id"],
             "email": user_data["email"],
             "role": user_data["role"],
+            "is_active": user_data.get("is_active", True),
             "exp": datetime.utcnow() + timedelta(hours=self.jwt_expiry_hours),
             "iat": datetime.utcnow()
         }
         
-        token = jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
+        token = jwt.encode(payload, self._jwt_key, algorithm=self.jwt_algorithm)
         return token
     
     def verify_jwt_token(self, token: str) -> Dict:
-        """Verify JWT token and return user data"""
+        """Verify JWT token and return user data, reusing recent verifications"""
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = _jwt_cache.get(key)
+        if cached is not None:
+            if cached["exp"] > time.time():
+                return dict(cached)
+            _jwt_cache.pop(key, None)
+        
         try:
-            payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
-            return payload
+            payload = jwt.decode(token, self._jwt_key, algorithms=[self.jwt_algorithm])
+            if "exp" in payload:
+                _jwt_cache[key] = payload
+            return dict(payload)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
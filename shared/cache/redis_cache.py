@@ -0,0 +1,109 @@
+"""
+Redis look-aside cache shared by the services
+"""
+import os
+import asyncio
+import json
+import logging
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+import orjson
+
+from shared.utils.encoding import json_default
+
+logger = logging.getLogger(__name__)
+
+# Approved-shop listings served by the customer API, one key per category
+APPROVED_SHOPS_PREFIX = "shops:approved:"
+APPROVED_SHOPS_TTL = 30
+
+
+class RedisCache:
+    def __init__(self):
+        # Caching is disabled unless REDIS_URL is configured
+        self.redis_url = os.getenv("REDIS_URL")
+        self._client = None
+    
+    @property
+    def client(self):
+        """Lazily connect so importing services without Redis stays cheap"""
+        if self._client is None and self.redis_url:
+            import redis.asyncio as redis
+            self._client = redis.from_url(self.redis_url)
+        return self._client
+    
+    async def get(self, key: str, decimals: bool = False) -> Optional[Any]:
+        """Get and decode a cached value; cache errors count as misses"""
+        if self.client is None:
+            return None
+        try:
+            cached = await self.client.get(key)
+        except Exception as e:
+            logger.warning("Redis get failed for %s: %s", key, e)
+            return None
+        if cached is None:
+            return None
+        if decimals:
+            # Numbers come back as Decimal, the way boto3 returns DynamoDB items
+            return json.loads(cached, parse_float=Decimal, parse_int=Decimal)
+        return orjson.loads(cached)
+    
+    async def set(self, key: str, value: Any, ttl: int):
+        """Encode and store a value for ttl seconds"""
+        if self.client is None:
+            return
+        try:
+            await self.client.setex(key, ttl, orjson.dumps(value, default=json_default))
+        except Exception as e:
+            logger.warning("Redis set failed for %s: %s", key, e)
+    
+    async def delete(self, *keys: str):
+        """Drop the given keys"""
+        if self.client is None or not keys:
+            return
+        try:
+            await self.client.delete(*keys)
+        except Exception as e:
+            logger.warning("Redis delete failed for %s: %s", ", ".join(keys), e)
+    
+    async def delete_prefix(self, prefix: str):
+        """Drop every key starting with prefix"""
+        if self.client is None:
+            return
+        try:
+            keys = [key async for key in self.client.scan_iter(match=f"{prefix}*")]
+            if keys:
+                await self.client.delete(*keys)
+        except Exception as e:
+            logger.warning("Redis delete failed for %s*: %s", prefix, e)
+    
+    async def publish(self, channel: str, message: str):
+        """Publish a message to every subscriber of channel"""
+        if self.client is None:
+            return
+        try:
+            await self.client.publish(channel, message)
+        except Exception as e:
+            logger.warning("Redis publish failed for %s: %s", channel, e)
+    
+    async def listen(self, channel: str, handler: Callable[[str], None]):
+        """Call handler with each message published on channel until cancelled"""
+        if self.client is None:
+            return
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            handler(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Redis subscription to %s failed, retrying: %s", channel, e)
+                await asyncio.sleep(1)
+
+
+# Global instance
+cache_service = RedisCache()
@@ -2,13 +2,143 @@
 DynamoDB service for the platform
 """
 import os
+import asyncio
+import base64
+import functools
+import heapq
+import threading
+import time
 import boto3
 import json
-from typing import Dict, List, Optional, Any
+import logging
+from decimal import Decimal
+from typing import Dict, List, Optional, Any, Tuple, get_args
 from datetime import datetime
+from operator import itemgetter
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from cachetools import TTLCache
+from contextvars import ContextVar
+from pydantic import BaseModel
+from shared.cache.redis_cache import cache_service
 from shared.models.base import BaseUser, Shop, Product, Order, Review, Address
+from shared.utils.clock import now_iso
 
+logger = logging.getLogger(__name__)
+
+# Key of the denormalized counters item backing the admin dashboard
+STATS_KEY = {'pk': 'STATS#global'}
+
+def _shop_stats_key(shop_id: str) -> Dict:
+    """Key of the order counters item backing a shop's merchant dashboard"""
+    return {'pk': f'STATS#shop#{shop_id}'}
+
+# Shops, products and users change rarely, so hot point reads are served
+# from a short-lived per-process cache
+ITEM_CACHE_SIZE = 10_000
+ITEM_CACHE_TTL = 15
+
+# Behind that, point reads are shared between processes through Redis.
+# A miss that read an item before a concurrent write can cache the old copy
+# after the write's eviction, so the TTL bounds how long that can last:
+# shops and users gate orders and auth, and orders change status often
+ITEM_REDIS_PREFIX = "item:"
+ITEM_REDIS_TTL = 300
+ACCOUNT_REDIS_TTL = 30
+ORDER_REDIS_TTL = 10
+
+# Evicted item keys are announced here so every process drops its own copy
+ITEM_EVICTIONS_CHANNEL = "item-evictions"
+
+# Attributes of a counters item that are not counters. A seeding that has
+# not finished after STATS_SEED_TIMEOUT seconds may be taken over
+STATS_BOOKKEEPING = frozenset({'pk', 'seeded', 'claimed_at', 'seeded_from', 'seeded_at'})
+STATS_SEED_TIMEOUT = 300
+
+# Counters kept per shop for the merchant dashboard
+SHOP_STATS_FIELDS = ('total_orders', 'pending_orders', 'total_revenue')
+
+# Partition key of each paged table; index cursors also carry the index keys
+TABLE_KEYS = {
+    'users': 'user_id',
+    'shops': 'shop_id',
+    'products': 'product_id',
+    'orders': 'order_id',
+    'reviews': 'review_id'
+}
+
+def _cursor_keys(table, index_name: Optional[str] = None) -> frozenset:
+    """Attributes of a LastEvaluatedKey from a table or one of its indexes"""
+    keys = {TABLE_KEYS[table.name]}
+    if index_name:
+        # Indexes are named after their key attributes, e.g. shop_id-created_at-index
+        keys.update(index_name.removesuffix('-index').split('-'))
+    return frozenset(keys)
+
+def created_before(item: Dict, stamp: str) -> bool:
+    """Whether an item was created before an ISO timestamp from datetime.utcnow()"""
+    created = item.get('created_at', '')
+    if isinstance(created, datetime):
+        created = created.replace(tzinfo=None).isoformat()
+    return created < stamp
+
+def _item_key(table, item_id: str) -> str:
+    """Redis key of a cached item"""
+    return f"{ITEM_REDIS_PREFIX}{table.name}:{item_id}"
+
+# Equality conditions are immutable, so hot queries reuse them instead of
+# building new ones for every request
+@functools.lru_cache(maxsize=512, typed=True)
+def _key_eq(name: str, value: Any):
+    """Cached Key(name).eq(value) condition"""
+    return Key(name).eq(value)
+
+@functools.lru_cache(maxsize=512, typed=True)
+def _attr_eq(name: str, value: Any):
+    """Cached Attr(name).eq(value) condition"""
+    return Attr(name).eq(value)
+
+def _datetime_fields(*models) -> frozenset:
+    """Names of the datetime fields declared on the given models"""
+    return frozenset(
+        name
+        for model in models
+        for name, field in model.model_fields.items()
+        if datetime in (field.annotation, *get_args(field.annotation))
+    )
+
+# The only attributes that hold timestamps, so reads never look at the rest
+DATETIME_FIELDS = _datetime_fields(BaseUser, Shop, Product, Order, Review, Address) | {'moderated_at'}
+
+def _to_item(model: BaseModel) -> Dict:
+    """Dump a model as a DynamoDB item: datetimes and enums become strings, floats Decimals"""
+    # pydantic-core writes the JSON straight from the model, without an
+    # intermediate dict; datetimes keep the same ISO form as isoformat()
+    return json.loads(model.model_dump_json(), parse_float=Decimal)
+
+# Event loop of the async call running a blocking write on a worker thread,
+# with the Redis keys it evicted; the async Redis client belongs to that loop
+_evicted_keys: ContextVar[Optional[Tuple[asyncio.AbstractEventLoop, List[str]]]] = ContextVar('_evicted_keys', default=None)
+
+def _offloaded(method):
+    """Run a blocking boto3 method on a worker thread so it does not stall the event loop"""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        evicted = []
+        token = _evicted_keys.set((asyncio.get_running_loop(), evicted))
+        try:
+            return await asyncio.to_thread(method, self, *args, **kwargs)
+        finally:
+            _evicted_keys.reset(token)
+            if evicted:
+                # Evicted again once the write is done: a concurrent miss
+                # may have cached the old item while the write was running
+                message = " ".join(evicted)
+                self._drop_evicted(message)
+                await cache_service.delete(*evicted)
+                await cache_service.publish(ITEM_EVICTIONS_CHANNEL, message)
+    return wrapper
 
 class DynamoDBService:
     def __init__(self):
@@ -18,6 +148,16 @@ class DynamoDBService:
         aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
         endpoint_url = os.getenv("DYNAMODB_ENDPOINT_URL")
         env = os.getenv("ENVIRONMENT", "production")
+        
+        # Requests are built by this service only, so skip botocore's
+        # client-side parameter validation on every call. The pool is sized
+        # for concurrent handlers and idle sockets are kept alive
+        config = Config(
+            parameter_validation=False,
+            max_pool_connections=200,
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+            tcp_keepalive=True
+        )
 
         # Use endpoint_url only for local development
         if env == "development" and endpoint_url:
@@ -26,7 +166,8 @@ class DynamoDBService:
                 endpoint_url=endpoint_url,
                 region_name=region,
                 aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key
+                aws_secret_access_key=aws_secret_access_key,
+                config=config
             )
         else:
             # For AWS, use region and credentials if provided, else use default provider chain
@@ -34,7 +175,15 @@ class DynamoDBService:
             if aws_access_key_id and aws_secret_access_key:
                 session_kwargs["aws_access_key_id"] = aws_access_key_id
                 session_kwargs["aws_secret_access_key"] = aws_secret_access_key
-            self.dynamodb = boto3.resource('dynamodb', **session_kwargs)
+            self.dynamodb = boto3.resource('dynamodb', config=config, **session_kwargs)
+        
+        # Optional DAX cluster serving reads; writes always go to DynamoDB
+        self.dax = None
+        self._dax_tables = {}
+        dax_endpoint_url = os.getenv("DAX_ENDPOINT_URL")
+        if dax_endpoint_url:
+            from amazondax import AmazonDaxClient
+            self.dax = AmazonDaxClient.resource(endpoint_url=dax_endpoint_url, region_name=region)
         
         # Table names
         self.users_table = self.dynamodb.Table('users')
@@ -43,6 +192,22 @@ class DynamoDBService:
         self.orders_table = self.dynamodb.Table('orders')
         self.reviews_table = self.dynamodb.Table('reviews')
         self.addresses_table = self.dynamodb.Table('addresses')
+        self.stats_table = self.dynamodb.Table('stats')
+        
+        self._shop_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL)
+        self._product_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL)
+        self._user_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL)
+        self._caches_by_table = {
+            self.shops_table.name: self._shop_cache,
+            self.products_table.name: self._product_cache,
+            self.users_table.name: self._user_cache
+        }
+        # Caches are shared between the event loop and worker threads
+        self._cache_lock = threading.Lock()
+    
+    async def close(self):
+        """Close the pooled DynamoDB connections"""
+        self.dynamodb.meta.client.close()
     
     def _serialize_datetime(self, obj):
         """Convert datetime objects to ISO string for DynamoDB"""
@@ -50,9 +215,171 @@ class DynamoDBService:
             return obj.isoformat()
         return obj
     
+    def _encode_cursor(self, last_key: Optional[Dict]) -> Optional[str]:
+        """Encode a LastEvaluatedKey as an opaque pagination cursor"""
+        if not last_key:
+            return None
+        return base64.urlsafe_b64encode(json.dumps(last_key).encode()).decode()
+    
+    def _decode_cursor(self, cursor: str, keys: frozenset) -> Dict:
+        """Decode a pagination cursor back into an ExclusiveStartKey with exactly the given attributes"""
+        try:
+            start_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid pagination cursor")
+        # Requests skip client-side validation, so a forged key would only
+        # fail inside DynamoDB
+        if (
+            not isinstance(start_key, dict)
+            or start_key.keys() != keys
+            or not all(isinstance(value, str) for value in start_key.values())
+        ):
+            raise ValueError("Invalid pagination cursor")
+        return start_key
+    
+    def _read(self, table, operation: str, **kwargs) -> Dict:
+        """Run a read through DAX when configured, falling back to DynamoDB"""
+        if self.dax is not None:
+            dax_table = self._dax_tables.get(table.name)
+            if dax_table is None:
+                dax_table = self._dax_tables[table.name] = self.dax.Table(table.name)
+            try:
+                return getattr(dax_table, operation)(**kwargs)
+            except ClientError:
+                raise
+            except Exception as e:
+                logger.warning("DAX %s on %s failed, reading from DynamoDB: %s", operation, table.name, e)
+        return getattr(table, operation)(**kwargs)
+    
+    def _page(self, table, operation: str, limit: Optional[int], cursor: Optional[str] = None, **kwargs) -> Tuple[List[Dict], Optional[str]]:
+        """Run a single scan/query page and return its items with the next cursor"""
+        # Without a limit DynamoDB returns up to 1MB per page
+        if limit:
+            kwargs['Limit'] = limit
+        if cursor:
+            kwargs['ExclusiveStartKey'] = self._decode_cursor(cursor, _cursor_keys(table, kwargs.get('IndexName')))
+        
+        response = self._read(table, operation, **kwargs)
+        items = [self._deserialize_datetime(item) for item in response.get('Items', [])]
+        return items, self._encode_cursor(response.get('LastEvaluatedKey'))
+    
+    def _update_existing(self, table, key: Dict, condition=None, **kwargs) -> Optional[Dict]:
+        """Run update_item only if the item exists (and matches condition); returns None otherwise"""
+        condition_expression = Attr(next(iter(key))).exists()
+        if condition is not None:
+            condition_expression &= condition
+        try:
+            return table.update_item(
+                Key=key,
+                ConditionExpression=condition_expression,
+                **kwargs
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise
+    
+    async def _get_cached(self, cache: Optional[TTLCache], table, key_name: str, item_id: str, ttl: int = ITEM_REDIS_TTL) -> Optional[Dict]:
+        """Get an item by key through the process cache (if any) and Redis; callers get their own shallow copy"""
+        item = None
+        if cache is not None:
+            with self._cache_lock:
+                item = cache.get(item_id)
+        if item is None:
+            item = await cache_service.get(_item_key(table, item_id), decimals=True)
+            if item is not None:
+                item = self._deserialize_datetime(item)
+            else:
+                # Only misses leave the event loop
+                response = await asyncio.to_thread(self._read, table, 'get_item', Key={key_name: item_id})
+                if 'Item' not in response:
+                    return None
+                # Cached as stored, so hits decode to the same types as this read
+                await cache_service.set(_item_key(table, item_id), response['Item'], ttl)
+                item = self._deserialize_datetime(response['Item'])
+            if cache is not None:
+                with self._cache_lock:
+                    cache[item_id] = item
+        return dict(item)
+    
+    def _evict(self, cache: Optional[TTLCache], table, item_id: str):
+        """Drop an item from the process cache (if any) and Redis, and again once the write returns"""
+        if cache is not None:
+            with self._cache_lock:
+                cache.pop(item_id, None)
+        context = _evicted_keys.get()
+        if context is not None:
+            loop, evicted = context
+            key = _item_key(table, item_id)
+            if cache_service.redis_url:
+                asyncio.run_coroutine_threadsafe(cache_service.delete(key), loop).result()
+            evicted.append(key)
+    
+    async def listen_for_evictions(self):
+        """Drop process-cached items as other processes announce writes to them"""
+        await cache_service.listen(ITEM_EVICTIONS_CHANNEL, self._drop_evicted)
+    
+    def _drop_evicted(self, message: str):
+        """Drop the items named by an eviction message from the process caches"""
+        for key in message.split():
+            table_name, _, item_id = key[len(ITEM_REDIS_PREFIX):].partition(':')
+            cache = self._caches_by_table.get(table_name)
+            if cache is not None:
+                with self._cache_lock:
+                    cache.pop(item_id, None)
+    
+    async def _batch_get_cached(self, cache: TTLCache, table, key_name: str, ids: List[str]) -> Dict[str, Dict]:
+        """Get several items by key, reading only process cache misses with BatchGetItem"""
+        items = {}
+        missing = []
+        with self._cache_lock:
+            for item_id in ids:
+                cached = cache.get(item_id)
+                if cached is None:
+                    missing.append(item_id)
+                else:
+                    items[item_id] = dict(cached)
+        
+        if missing:
+            fetched = await asyncio.to_thread(self._batch_get, table, key_name, missing)
+            with self._cache_lock:
+                for item in fetched:
+                    cache[item[key_name]] = item
+                    items[item[key_name]] = dict(item)
+        return items
+    
+    def _batch_get(self, table, key_name: str, ids: List[str], max_retries: int = 5) -> List[Dict]:
+        """Fetch items by key with BatchGetItem, 100 keys per call"""
+        items = []
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), 100):
+            request = {table.name: {'Keys': [{key_name: i} for i in unique_ids[start:start + 100]]}}
+            for attempt in range(max_retries + 1):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                items.extend(self._deserialize_datetime(item) for item in response['Responses'].get(table.name, []))
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+                if attempt == max_retries:
+                    raise RuntimeError(f"Unprocessed keys remain for {table.name} after {max_retries} retries")
+                # Exponential backoff before retrying throttled keys
+                time.sleep(0.05 * (2 ** attempt))
+        return items
+    
+    def _scan_all(self, table, operation: str = 'scan', **kwargs) -> List[Dict]:
+        """Scan a whole table (or run a whole query), following LastEvaluatedKey across pages"""
+        items = []
+        while True:
+            response = self._read(table, operation, **kwargs)
+            items.extend(self._deserialize_datetime(item) for item in response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return items
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
     def _deserialize_datetime(self, data: Dict) -> Dict:
         """Convert ISO strings back to datetime objects"""
-        for key, value in data.items():
+        for key in DATETIME_FIELDS:
+            value = data.get(key)
             if isinstance(value, str) and 'T' in value and value.endswith('Z'):
                 try:
                     data[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
@@ -60,210 +387,602 @@ class DynamoDBService:
                     pass
         return data
     
+    # Stats operations
+    @_offloaded
+    def get_stats(self, key: Dict = STATS_KEY) -> Optional[Dict]:
+        """Get the platform counters item; None until it is seeded"""
+        return self._get_stats(key)
+    
+    def _get_stats(self, key: Dict) -> Optional[Dict]:
+        """Get a seeded counters item without its bookkeeping attributes"""
+        item = self.stats_table.get_item(Key=key).get('Item')
+        # Items seeded before the flag existed carry no 'seeded' attribute
+        if item is None or item.get('seeded') is False:
+            return None
+        return self._counters(item)
+    
+    def _counters(self, item: Dict) -> Dict:
+        """Strip the key and seeding bookkeeping from a counters item"""
+        return {k: v for k, v in item.items() if k not in STATS_BOOKKEEPING}
+    
+    @_offloaded
+    def claim_stats(self, key: Dict = STATS_KEY) -> Optional[str]:
+        """Claim the counters item for seeding; returns the claim, or None if taken"""
+        return self._claim_stats(key)
+    
+    def _claim_stats(self, key: Dict) -> Optional[str]:
+        """Create an empty counters item to seed, or take over a seeding abandoned for STATS_SEED_TIMEOUT"""
+        # The claim splits the counting: the seeding scan counts only items
+        # created before seeded_from, and _bump_stats counts only the rest,
+        # so nothing is counted twice
+        now = time.time()
+        seeded_from = datetime.utcnow().isoformat()
+        try:
+            self.stats_table.put_item(
+                Item={**key, 'seeded': False, 'claimed_at': Decimal(str(now)), 'seeded_from': seeded_from},
+                ConditionExpression=Attr('pk').not_exists() | (
+                    _attr_eq('seeded', False) & Attr('claimed_at').lt(Decimal(str(now - STATS_SEED_TIMEOUT)))
+                )
+            )
+            return seeded_from
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise
+    
+    @_offloaded
+    def finish_stats(self, stats: Dict, seeded_from: str, key: Dict = STATS_KEY) -> Optional[Dict]:
+        """Add seeding totals to a claimed counters item; returns its counters, or None if the claim was lost"""
+        return self._finish_stats(stats, seeded_from, key)
+    
+    def _finish_stats(self, stats: Dict, seeded_from: str, key: Dict) -> Optional[Dict]:
+        """Add a seeding scan's totals to the counters written since the claim and mark the item seeded"""
+        response = self._update_existing(
+            self.stats_table,
+            key,
+            _attr_eq('seeded_from', seeded_from),
+            UpdateExpression=(
+                "ADD " + ", ".join(f"#{k} :{k}" for k in stats)
+                + " SET #seeded = :seeded, #seeded_at = :seeded_at REMOVE #claimed_at"
+            ),
+            ExpressionAttributeNames={
+                **{f"#{k}": k for k in stats},
+                '#seeded': 'seeded', '#seeded_at': 'seeded_at', '#claimed_at': 'claimed_at'
+            },
+            ExpressionAttributeValues={
+                **{f":{k}": Decimal(str(v)) for k, v in stats.items()},
+                ':seeded': True, ':seeded_at': datetime.utcnow().isoformat()
+            },
+            ReturnValues="ALL_NEW"
+        )
+        if response is None:
+            return None
+        return self._counters(response['Attributes'])
+    
+    def _put_stats(self, stats: Dict, key: Dict):
+        """Write a seeded counters item for a new owner that nothing has counted yet"""
+        item = {k: Decimal(str(v)) for k, v in stats.items()}
+        self.stats_table.put_item(Item={**key, **item, 'seeded': True})
+    
+    def _bump_stats(self, key: Dict = STATS_KEY, *, created: str, written: str, **deltas):
+        """Atomically add the deltas of a write made at `written` to an item created at `created`"""
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return
+        
+        # Until the item is claimed, the write is in the table for the
+        # seeding scan to count. After that, items created before the claim
+        # belong to the scan unless written after it finished. A status
+        # change landing during the scan on an item it has already read is
+        # counted by neither, so a seeding may undercount but never double counts
+        try:
+            self.stats_table.update_item(
+                Key=key,
+                UpdateExpression="ADD " + ", ".join(f"#{k} :{k}" for k in deltas),
+                ExpressionAttributeNames={f"#{k}": k for k in deltas},
+                ExpressionAttributeValues={f":{k}": Decimal(str(v)) for k, v in deltas.items()},
+                ConditionExpression=Attr('pk').exists() & (
+                    Attr('seeded_from').not_exists()
+                    | Attr('seeded_from').lte(created)
+                    | Attr('seeded_at').lte(written)
+                )
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+    
     # User operations
-    async def create_user(self, user: BaseUser) -> Dict:
+    @_offloaded
+    def create_user(self, user: BaseUser) -> Dict:
         """Create a new user"""
-        user_data = user.dict()
-        user_data = {k: self._serialize_datetime(v) for k, v in user_data.items()}
+        user_data = _to_item(user)
         
         self.users_table.put_item(Item=user_data)
+        self._evict(self._user_cache, self.users_table, user_data['user_id'])
+        self._bump_stats(created=user_data['created_at'], written=user_data['created_at'], total_users=1)
         return user_data
     
     async def get_user(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
-        response = self.users_table.get_item(Key={'user_id': user_id})
-        if 'Item' in response:
-            return self._deserialize_datetime(response['Item'])
-        return None
+        return await self._get_cached(self._user_cache, self.users_table, 'user_id', user_id, ACCOUNT_REDIS_TTL)
+    
+    async def batch_get_users(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """Get several users by ID, keyed by user_id; missing users are omitted"""
+        return await self._batch_get_cached(self._user_cache, self.users_table, 'user_id', user_ids)
     
-    async def update_user(self, user_id: str, updates: Dict) -> Optional[Dict]:
+    @_offloaded
+    def update_user(self, user_id: str, updates: Dict) -> Optional[Dict]:
         """Update user data"""
-        update_expression = "SET "
-        expression_values = {}
-        
+        names = {}
+        values = {}
+        assignments = []
         for key, value in updates.items():
             if key != 'user_id':
-                update_expression += f"#{key} = :{key}, "
-                expression_values[f":{key}"] = self._serialize_datetime(value)
-                expression_values[f"#{key}"] = key
-        
-        update_expression = update_expression.rstrip(", ")
+                names[f"#{key}"] = key
+                values[f":{key}"] = self._serialize_datetime(value)
+                assignments.append(f"#{key} = :{key}")
         
-        response = self.users_table.update_item(
-            Key={'user_id': user_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values,
-            ExpressionAttributeNames={v: k for k, v in expression_values.items() if k.startswith('#')},
+        self._evict(self._user_cache, self.users_table, user_id)
+        response = self._update_existing(
+            self.users_table,
+            {'user_id': user_id},
+            UpdateExpression="SET " + ", ".join(assignments),
+            ExpressionAttributeValues=values,
+            ExpressionAttributeNames=names,
             ReturnValues="ALL_NEW"
         )
         
-        if 'Attributes' in response:
+        if response and 'Attributes' in response:
             return self._deserialize_datetime(response['Attributes'])
         return None
     
+    @_offloaded
+    def get_all_users(self) -> List[Dict]:
+        """Get all users"""
+        return self._scan_all(self.users_table)
+    
+    @_offloaded
+    def list_users(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of users"""
+        return self._page(self.users_table, 'scan', limit, cursor)
+    
     # Shop operations
-    async def create_shop(self, shop: Shop) -> Dict:
+    @_offloaded
+    def create_shop(self, shop: Shop) -> Dict:
         """Create a new shop"""
-        shop_data = shop.dict()
-        shop_data = {k: self._serialize_datetime(v) for k, v in shop_data.items()}
+        shop_data = _to_item(shop)
+        # Lower-cased copy of the name for case-insensitive search filters
+        shop_data['name_lower'] = shop_data['name'].lower()
         
         self.shops_table.put_item(Item=shop_data)
+        self._bump_stats(
+            created=shop_data['created_at'],
+            written=shop_data['created_at'],
+            total_shops=1,
+            pending_shop_approvals=int(shop_data.get('status') == 'pending_approval')
+        )
+        # A new shop has no orders, so its counters start seeded at zero
+        self._put_stats(dict.fromkeys(SHOP_STATS_FIELDS, 0), _shop_stats_key(shop_data['shop_id']))
         return shop_data
     
     async def get_shop(self, shop_id: str) -> Optional[Dict]:
         """Get shop by ID"""
-        response = self.shops_table.get_item(Key={'shop_id': shop_id})
-        if 'Item' in response:
-            return self._deserialize_datetime(response['Item'])
-        return None
+        return await self._get_cached(self._shop_cache, self.shops_table, 'shop_id', shop_id, ACCOUNT_REDIS_TTL)
+    
+    async def batch_get_shops(self, shop_ids: List[str]) -> Dict[str, Dict]:
+        """Get several shops by ID, keyed by shop_id; missing shops are omitted"""
+        return await self._batch_get_cached(self._shop_cache, self.shops_table, 'shop_id', shop_ids)
     
-    async def get_shops_by_merchant(self, merchant_id: str) -> List[Dict]:
+    @_offloaded
+    def get_shops_by_merchant(self, merchant_id: str) -> List[Dict]:
         """Get all shops for a merchant"""
-        response = self.shops_table.query(
+        return self._scan_all(
+            self.shops_table, 'query',
             IndexName='merchant_id-index',
-            KeyConditionExpression=Key('merchant_id').eq(merchant_id)
+            KeyConditionExpression=_key_eq('merchant_id', merchant_id)
         )
-        
-        shops = []
-        for item in response.get('Items', []):
-            shops.append(self._deserialize_datetime(item))
-        
-        return shops
     
-    async def get_approved_shops(self, category: Optional[str] = None) -> List[Dict]:
-        """Get all approved shops, optionally filtered by category"""
+    @_offloaded
+    def get_approved_shops(self, category: Optional[str] = None, search: Optional[str] = None, is_open: Optional[bool] = None) -> List[Dict]:
+        """Get approved shops, optionally filtered by category, name search and open flag"""
+        # The category is the index sort key, so only matching shops are read
+        key_condition = _key_eq('status', 'approved')
         if category:
-            response = self.shops_table.scan(
-                FilterExpression=Attr('status').eq('approved') & Attr('category').eq(category)
-            )
-        else:
-            response = self.shops_table.scan(
-                FilterExpression=Attr('status').eq('approved')
-            )
+            key_condition = key_condition & _key_eq('category', category)
         
-        shops = []
-        for item in response.get('Items', []):
-            shops.append(self._deserialize_datetime(item))
+        filters = []
+        if search:
+            filters.append(Attr('name_lower').contains(search.lower()))
+        if is_open is not None:
+            filters.append(_attr_eq('is_open', is_open))
         
-        return shops
+        kwargs = {}
+        if filters:
+            filter_expression = filters[0]
+            for condition in filters[1:]:
+                filter_expression = filter_expression & condition
+            kwargs['FilterExpression'] = filter_expression
+        
+        return self._scan_all(
+            self.shops_table, 'query',
+            IndexName='status-category-index',
+            KeyConditionExpression=key_condition,
+            **kwargs
+        )
     
-    async def update_shop_status(self, shop_id: str, status: str) -> Optional[Dict]:
-        """Update shop approval status"""
-        response = self.shops_table.update_item(
-            Key={'shop_id': shop_id},
-            UpdateExpression="SET #status = :status, #updated_at = :updated_at",
-            ExpressionAttributeValues={
-                ':status': status,
-                ':updated_at': self._serialize_datetime(datetime.utcnow())
-            },
-            ExpressionAttributeNames={
-                '#status': 'status',
-                '#updated_at': 'updated_at'
-            },
+    @_offloaded
+    def get_all_shops(self) -> List[Dict]:
+        """Get all shops regardless of status"""
+        return self._scan_all(self.shops_table)
+    
+    @_offloaded
+    def list_shops(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of shops regardless of status"""
+        return self._page(self.shops_table, 'scan', limit, cursor)
+    
+    @_offloaded
+    def query_shops_by_status(self, status: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of shops with the given status"""
+        return self._page(
+            self.shops_table, 'query', limit, cursor,
+            IndexName='status-index',
+            KeyConditionExpression=_key_eq('status', status)
+        )
+    
+    @_offloaded
+    def update_shop(self, shop_id: str, updates: Dict) -> Optional[Dict]:
+        """Update shop details"""
+        return self._update_shop(shop_id, updates)
+    
+    @_offloaded
+    def update_shop_if_owner(self, shop_id: str, merchant_id: str, updates: Dict) -> Optional[Dict]:
+        """Update shop details in one conditional write; returns None unless the merchant owns the shop"""
+        return self._update_shop(shop_id, updates, _attr_eq('merchant_id', merchant_id))
+    
+    def _update_shop(self, shop_id: str, updates: Dict, condition=None) -> Optional[Dict]:
+        """SET the given shop fields, optionally guarded by an extra condition"""
+        names = {}
+        values = {}
+        assignments = []
+        for index, (key, value) in enumerate(updates.items()):
+            if key != 'shop_id':
+                names[f"#f{index}"] = key
+                values[f":f{index}"] = self._serialize_datetime(value)
+                assignments.append(f"#f{index} = :f{index}")
+        
+        self._evict(self._shop_cache, self.shops_table, shop_id)
+        response = self._update_existing(
+            self.shops_table,
+            {'shop_id': shop_id},
+            condition,
+            UpdateExpression="SET " + ", ".join(assignments),
+            ExpressionAttributeValues=values,
+            ExpressionAttributeNames=names,
             ReturnValues="ALL_NEW"
         )
+        if response is None:
+            return None
+        return self._deserialize_datetime(response['Attributes'])
+    
+    @_offloaded
+    def update_shop_status(self, shop_id: str, status: str, fields: Optional[Dict] = None) -> Optional[Dict]:
+        """Update shop approval status, setting any extra fields in the same write"""
+        self._evict(self._shop_cache, self.shops_table, shop_id)
+        updates = {'status': status, 'updated_at': now_iso(), **(fields or {})}
+        response = self._update_existing(
+            self.shops_table,
+            {'shop_id': shop_id},
+            UpdateExpression="SET " + ", ".join(f"#{k} = :{k}" for k in updates),
+            ExpressionAttributeValues={f":{k}": v for k, v in updates.items()},
+            ExpressionAttributeNames={f"#{k}": k for k in updates},
+            ReturnValues="ALL_OLD"
+        )
+        if response is None:
+            return None
         
-        if 'Attributes' in response:
-            return self._deserialize_datetime(response['Attributes'])
-        return None
+        old = response['Attributes']
+        self._bump_stats(
+            created=old.get('created_at', ''),
+            written=updates['updated_at'],
+            pending_shop_approvals=int(status == 'pending_approval') - int(old.get('status') == 'pending_approval')
+        )
+        shop = {**old, 'shop_id': shop_id, **updates}
+        return self._deserialize_datetime(shop)
     
     # Product operations
-    async def create_product(self, product: Product) -> Dict:
+    @_offloaded
+    def create_product(self, product: Product) -> Dict:
         """Create a new product"""
-        product_data = product.dict()
-        product_data = {k: self._serialize_datetime(v) for k, v in product_data.items()}
+        product_data = _to_item(product)
         
         self.products_table.put_item(Item=product_data)
         return product_data
     
+    @_offloaded
+    def bulk_create_products(self, products: List[Product]) -> List[Dict]:
+        """Create several products of one shop with BatchWriteItem, 25 items per call"""
+        created = []
+        # The writer retries unprocessed items and drops repeated product ids
+        with self.products_table.batch_writer(overwrite_by_pkeys=['product_id']) as writer:
+            for product in products:
+                product_data = _to_item(product)
+                writer.put_item(Item=product_data)
+                created.append(product_data)
+        return created
+    
     async def get_product(self, product_id: str) -> Optional[Dict]:
         """Get product by ID"""
-        response = self.products_table.get_item(Key={'product_id': product_id})
-        if 'Item' in response:
-            return self._deserialize_datetime(response['Item'])
-        return None
+        return await self._get_cached(self._product_cache, self.products_table, 'product_id', product_id)
+    
+    async def batch_get_products(self, product_ids: List[str]) -> Dict[str, Dict]:
+        """Get several products by ID, keyed by product_id; missing products are omitted"""
+        return await self._batch_get_cached(self._product_cache, self.products_table, 'product_id', product_ids)
     
-    async def get_products_by_shop(self, shop_id: str) -> List[Dict]:
-        """Get all products for a shop"""
-        response = self.products_table.query(
+    @_offloaded
+    def get_products_by_shop(self, shop_id: str, category: Optional[str] = None) -> List[Dict]:
+        """Get all products for a shop, optionally only one category"""
+        if category:
+            return self._scan_all(
+                self.products_table, 'query',
+                IndexName='shop_id-category-index',
+                KeyConditionExpression=_key_eq('shop_id', shop_id) & _key_eq('category', category)
+            )
+        return self._scan_all(
+            self.products_table, 'query',
             IndexName='shop_id-index',
-            KeyConditionExpression=Key('shop_id').eq(shop_id)
+            KeyConditionExpression=_key_eq('shop_id', shop_id)
+        )
+    
+    @_offloaded
+    def get_products_page_by_shop(self, shop_id: str, category: Optional[str] = None, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one DynamoDB page of a shop's products, optionally only one category"""
+        if category:
+            return self._page(
+                self.products_table, 'query', None, cursor,
+                IndexName='shop_id-category-index',
+                KeyConditionExpression=_key_eq('shop_id', shop_id) & _key_eq('category', category)
+            )
+        return self._page(
+            self.products_table, 'query', None, cursor,
+            IndexName='shop_id-index',
+            KeyConditionExpression=_key_eq('shop_id', shop_id)
         )
-        
-        products = []
-        for item in response.get('Items', []):
-            products.append(self._deserialize_datetime(item))
-        
-        return products
     
     # Order operations
-    async def create_order(self, order: Order) -> Dict:
+    @_offloaded
+    def create_order(self, order: Order) -> Dict:
         """Create a new order"""
-        order_data = order.dict()
-        order_data = {k: self._serialize_datetime(v) for k, v in order_data.items()}
+        order_data = _to_item(order)
         
         self.orders_table.put_item(Item=order_data)
+        deltas = {
+            'total_orders': 1,
+            'pending_orders': int(order_data.get('status') == 'pending'),
+            'total_revenue': order_data['total_amount'] if order_data.get('status') == 'delivered' else 0
+        }
+        stamps = {'created': order_data['created_at'], 'written': order_data['created_at']}
+        self._bump_stats(**stamps, **deltas)
+        self._bump_stats(_shop_stats_key(order_data['shop_id']), **stamps, **deltas)
         return order_data
     
     async def get_order(self, order_id: str) -> Optional[Dict]:
         """Get order by ID"""
-        response = self.orders_table.get_item(Key={'order_id': order_id})
-        if 'Item' in response:
-            return self._deserialize_datetime(response['Item'])
-        return None
+        # Order status changes too often for a per-process copy; Redis is
+        # shared, so every write can evict it everywhere
+        return await self._get_cached(None, self.orders_table, 'order_id', order_id, ORDER_REDIS_TTL)
     
-    async def get_orders_by_customer(self, customer_id: str) -> List[Dict]:
+    @_offloaded
+    def get_orders_by_customer(self, customer_id: str) -> List[Dict]:
         """Get all orders for a customer"""
-        response = self.orders_table.query(
+        return self._scan_all(
+            self.orders_table, 'query',
             IndexName='customer_id-index',
-            KeyConditionExpression=Key('customer_id').eq(customer_id)
+            KeyConditionExpression=_key_eq('customer_id', customer_id)
+        )
+    
+    @_offloaded
+    def get_orders_page_by_customer(self, customer_id: str, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one DynamoDB page of a customer's orders"""
+        return self._page(
+            self.orders_table, 'query', None, cursor,
+            IndexName='customer_id-index',
+            KeyConditionExpression=_key_eq('customer_id', customer_id)
         )
-        
-        orders = []
-        for item in response.get('Items', []):
-            orders.append(self._deserialize_datetime(item))
-        
-        return orders
     
-    async def get_orders_by_shop(self, shop_id: str, status: Optional[str] = None) -> List[Dict]:
+    @_offloaded
+    def get_orders_by_shop(self, shop_id: str, status: Optional[str] = None) -> List[Dict]:
         """Get all orders for a shop, optionally filtered by status"""
+        return self._scan_all(self.orders_table, 'query', **self._shop_orders_query(shop_id, status))
+    
+    @_offloaded
+    def get_orders_page_by_shop(self, shop_id: str, status: Optional[str] = None, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one DynamoDB page of a shop's orders, optionally filtered by status"""
+        return self._page(self.orders_table, 'query', None, cursor, **self._shop_orders_query(shop_id, status))
+    
+    def _shop_orders_query(self, shop_id: str, status: Optional[str]) -> Dict:
+        """Query arguments selecting a shop's orders on the shop_id index"""
+        kwargs = {
+            'IndexName': 'shop_id-index',
+            'KeyConditionExpression': _key_eq('shop_id', shop_id)
+        }
         if status:
-            response = self.orders_table.query(
-                IndexName='shop_id-index',
-                KeyConditionExpression=Key('shop_id').eq(shop_id),
-                FilterExpression=Attr('status').eq(status)
-            )
-        else:
-            response = self.orders_table.query(
-                IndexName='shop_id-index',
-                KeyConditionExpression=Key('shop_id').eq(shop_id)
-            )
-        
-        orders = []
-        for item in response.get('Items', []):
-            orders.append(self._deserialize_datetime(item))
+            kwargs['FilterExpression'] = _attr_eq('status', status)
+        return kwargs
+    
+    async def get_shops_stats(self, shop_ids: List[str]) -> Dict[str, Any]:
+        """Sum the order counters of several shops"""
+        totals = dict.fromkeys(SHOP_STATS_FIELDS, 0)
+        for stats in await self._per_shop(self._shop_stats, shop_ids):
+            for field in SHOP_STATS_FIELDS:
+                totals[field] += stats.get(field, 0)
+        return totals
+    
+    async def get_recent_orders_by_shops(self, shop_ids: List[str], limit: int) -> List[Dict]:
+        """Get the newest orders across several shops"""
+        results = await self._per_shop(lambda shop_id: self._query_recent_orders(shop_id, limit), shop_ids)
+        return heapq.nlargest(limit, (order for orders in results for order in orders), key=itemgetter('created_at'))
+    
+    async def _per_shop(self, fetch, shop_ids: List[str]) -> List[Any]:
+        """Run a blocking per-shop read for several shops at once"""
+        # Reads have no multi-partition form, so run them side by side on
+        # worker threads instead of one after another
+        return await asyncio.gather(*(asyncio.to_thread(fetch, shop_id) for shop_id in shop_ids))
+    
+    def _shop_stats(self, shop_id: str) -> Dict:
+        """Get a shop's order counters, seeding them from its orders on first use"""
+        key = _shop_stats_key(shop_id)
+        stats = self._get_stats(key)
+        if stats is not None:
+            return stats
         
-        return orders
+        seeded_from = self._claim_stats(key)
+        orders = self._scan_all(
+            self.orders_table, 'query',
+            IndexName='shop_id-index',
+            KeyConditionExpression=_key_eq('shop_id', shop_id)
+        )
+        if seeded_from is not None:
+            # Orders created since the claim are counted by their own writes
+            orders = [order for order in orders if created_before(order, seeded_from)]
+        pending_orders = 0
+        total_revenue = 0
+        for order in orders:
+            status = order.get('status')
+            if status == 'pending':
+                pending_orders += 1
+            elif status == 'delivered':
+                total_revenue += order.get('total_amount', 0)
+        stats = {
+            'total_orders': len(orders),
+            'pending_orders': pending_orders,
+            'total_revenue': total_revenue
+        }
+        # Another request is seeding or has seeded; until it is done this
+        # scan's totals are served without being written
+        if seeded_from is None:
+            return self._get_stats(key) or stats
+        return self._finish_stats(stats, seeded_from, key) or stats
     
-    async def update_order_status(self, order_id: str, status: str) -> Optional[Dict]:
-        """Update order status"""
-        response = self.orders_table.update_item(
-            Key={'order_id': order_id},
-            UpdateExpression="SET #status = :status, #updated_at = :updated_at",
-            ExpressionAttributeValues={
-                ':status': status,
-                ':updated_at': self._serialize_datetime(datetime.utcnow())
-            },
-            ExpressionAttributeNames={
-                '#status': 'status',
-                '#updated_at': 'updated_at'
-            },
-            ReturnValues="ALL_NEW"
+    def _query_recent_orders(self, shop_id: str, limit: int) -> List[Dict]:
+        """Query a shop's newest orders on the shop_id-created_at index"""
+        response = self._read(
+            self.orders_table, 'query',
+            IndexName='shop_id-created_at-index',
+            KeyConditionExpression=_key_eq('shop_id', shop_id),
+            ScanIndexForward=False,
+            Limit=limit
         )
+        return [self._deserialize_datetime(item) for item in response.get('Items', [])]
+    
+    @_offloaded
+    def get_all_orders(self) -> List[Dict]:
+        """Get all orders"""
+        return self._scan_all(self.orders_table)
+    
+    @_offloaded
+    def list_orders(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of orders"""
+        return self._page(self.orders_table, 'scan', limit, cursor)
+    
+    @_offloaded
+    def query_orders_by_status(self, status: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of orders with the given status"""
+        return self._page(
+            self.orders_table, 'query', limit, cursor,
+            IndexName='status-index',
+            KeyConditionExpression=_key_eq('status', status)
+        )
+    
+    @_offloaded
+    def update_order_status(self, order_id: str, status: str, expected_status: Optional[str] = None, fields: Optional[Dict] = None) -> Optional[Dict]:
+        """Update order status and any extra fields, optionally only from expected_status; returns None if missing or moved on"""
+        self._evict(None, self.orders_table, order_id)
+        updates = {'status': status, 'updated_at': now_iso(), **(fields or {})}
+        response = self._update_existing(
+            self.orders_table,
+            {'order_id': order_id},
+            _attr_eq('status', expected_status) if expected_status is not None else None,
+            UpdateExpression="SET " + ", ".join(f"#{k} = :{k}" for k in updates),
+            ExpressionAttributeValues={f":{k}": v for k, v in updates.items()},
+            ExpressionAttributeNames={f"#{k}": k for k in updates},
+            ReturnValues="ALL_OLD"
+        )
+        if response is None:
+            return None
         
-        if 'Attributes' in response:
-            return self._deserialize_datetime(response['Attributes'])
+        old = response['Attributes']
+        old_status = old.get('status')
+        amount = old.get('total_amount', 0)
+        deltas = {
+            'pending_orders': int(status == 'pending') - int(old_status == 'pending'),
+            'total_revenue': (amount if status == 'delivered' else 0) - (amount if old_status == 'delivered' else 0)
+        }
+        stamps = {'created': old.get('created_at', ''), 'written': updates['updated_at']}
+        self._bump_stats(**stamps, **deltas)
+        if old.get('shop_id'):
+            self._bump_stats(_shop_stats_key(old['shop_id']), **stamps, **deltas)
+        
+        order = {**old, 'order_id': order_id, **updates}
+        return self._deserialize_datetime(order)
+    
+    # Review operations
+    @_offloaded
+    def get_review(self, review_id: str) -> Optional[Dict]:
+        """Get review by ID"""
+        response = self._read(self.reviews_table, 'get_item', Key={'review_id': review_id})
+        if 'Item' in response:
+            return self._deserialize_datetime(response['Item'])
         return None
+    
+    @_offloaded
+    def update_review_moderation(self, review_id: str, is_approved: bool, admin_notes: Optional[str], moderated_by: str) -> Optional[Dict]:
+        """Record an admin moderation decision on a review"""
+        updates = {
+            'is_approved': is_approved,
+            'admin_notes': admin_notes,
+            'moderated_at': now_iso(),
+            'moderated_by': moderated_by
+        }
+        response = self._update_existing(
+            self.reviews_table,
+            {'review_id': review_id},
+            UpdateExpression="SET " + ", ".join(f"#{k} = :{k}" for k in updates),
+            ExpressionAttributeValues={f":{k}": v for k, v in updates.items()},
+            ExpressionAttributeNames={f"#{k}": k for k in updates},
+            ReturnValues="ALL_OLD"
+        )
+        if response is None:
+            return None
+        
+        old = response['Attributes']
+        self._bump_stats(
+            created=old.get('created_at', ''),
+            written=updates['moderated_at'],
+            pending_reviews=int(not is_approved) - int(not old.get('is_approved'))
+        )
+        
+        review = {**old, 'review_id': review_id, **updates}
+        return self._deserialize_datetime(review)
+    
+    @_offloaded
+    def get_all_reviews(self) -> List[Dict]:
+        """Get all reviews"""
+        return self._scan_all(self.reviews_table)
+    
+    @_offloaded
+    def list_reviews(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of reviews"""
+        return self._page(self.reviews_table, 'scan', limit, cursor)
+    
+    @_offloaded
+    def query_reviews_by_approval(self, is_approved: bool, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of reviews with the given approval flag"""
+        # Booleans cannot be index keys, so this filters a scan page;
+        # a page may hold fewer than `limit` matches while a cursor remains
+        return self._page(
+            self.reviews_table, 'scan', limit, cursor,
+            FilterExpression=_attr_eq('is_approved', is_approved)
+        )
 
 
 # Global instance
@@ -0,0 +1,30 @@
+"""
+Cheap wall-clock timestamps for write paths
+"""
+import time
+from datetime import datetime
+
+# How long a formatted timestamp is reused, in seconds
+CLOCK_RESOLUTION = 0.1
+
+
+class ClockCache:
+    """UTC ISO timestamp, reformatted at most once per resolution interval"""
+
+    def __init__(self, resolution: float = CLOCK_RESOLUTION):
+        self.resolution = resolution
+        # Swapped as one tuple so worker threads never see a torn pair
+        self.last = (float("-inf"), "")
+
+    def now_iso(self) -> str:
+        """Current UTC time in the same ISO form as datetime.utcnow().isoformat()"""
+        now = time.monotonic()
+        last_ts, last_iso = self.last
+        if now - last_ts >= self.resolution:
+            last_iso = datetime.utcnow().isoformat()
+            self.last = (now, last_iso)
+        return last_iso
+
+
+# Process-wide clock; fine for audit fields such as updated_at
+now_iso = ClockCache().now_iso
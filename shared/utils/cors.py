@@ -0,0 +1,26 @@
+"""
+CORS setup shared by the services
+"""
+import os
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+DEFAULT_CORS_ORIGINS = "http://localhost:3000,http://localhost:5173"
+
+# Explicit lists let the middleware build its preflight headers once
+# instead of echoing back whatever each browser request asked for
+CORS_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+CORS_HEADERS = ["Authorization", "Content-Type"]
+
+
+def add_cors(app: FastAPI):
+    """Allow the frontends listed in CORS_ORIGINS (comma separated) to call the app"""
+    origins = [origin.strip() for origin in os.getenv("CORS_ORIGINS", DEFAULT_CORS_ORIGINS).split(",") if origin.strip()]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=CORS_METHODS,
+        allow_headers=CORS_HEADERS,
+    )
@@ -0,0 +1,11 @@
+"""
+JSON encoding helpers for DynamoDB items
+"""
+from decimal import Decimal
+
+
+def json_default(obj):
+    """Encode DynamoDB numbers, which boto3 returns as Decimal"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError
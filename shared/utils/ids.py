@@ -0,0 +1,12 @@
+"""
+Random identifier helpers
+"""
+import os
+import uuid
+from typing import List
+
+
+def new_uuids(count: int) -> List[str]:
+    """Generate count random UUID4 strings from a single os.urandom call"""
+    entropy = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=entropy[start:start + 16], version=4)) for start in range(0, 16 * count, 16)]
@@ -0,0 +1,59 @@
+"""
+Logging setup shared by the services
+"""
+import os
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Render each record as a single JSON line for log aggregation"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class _PassThroughQueueHandler(QueueHandler):
+    """Enqueue records untouched so formatting also happens on the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging() -> QueueListener:
+    """Route root logging through a queue drained by a background thread
+
+    Handlers on the event loop only enqueue; the returned listener writes to
+    stderr and must be stopped on shutdown to flush pending records.
+    LOG_LEVEL sets the level and LOG_FORMAT selects json (default) or text.
+    """
+    stream_handler = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        stream_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_PassThroughQueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    listener.start()
+    return listener
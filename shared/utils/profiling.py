@@ -0,0 +1,35 @@
+"""
+Opt-in request profiling with pyinstrument
+"""
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# Sampling interval in seconds
+PROFILE_INTERVAL = 0.001
+
+
+class ProfileMiddleware(BaseHTTPMiddleware):
+    """Profile requests sent with ?profile=1 and answer with the HTML report"""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.query_params.get("profile") != "1":
+            return await call_next(request)
+
+        from pyinstrument import Profiler
+        profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+        profiler.start()
+        response = await call_next(request)
+        # Drain the body so serialization is part of the profile
+        async for _ in response.body_iterator:
+            pass
+        profiler.stop()
+        return HTMLResponse(profiler.output_html())
+
+
+def add_profiling(app: FastAPI):
+    """Install the profiling middleware when PROFILING=true (requires pyinstrument)"""
+    if os.getenv("PROFILING", "false").lower() == "true":
+        app.add_middleware(ProfileMiddleware)
@@ -0,0 +1,37 @@
+"""
+Streaming JSON responses for large listings
+"""
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from shared.utils.encoding import json_default
+
+# Fetches the page after the given cursor, returning its items and the next cursor
+PageFetcher = Callable[[str], Awaitable[Tuple[List[Dict], Optional[str]]]]
+
+
+def _encode_page(items: List[Dict]) -> bytes:
+    """Encode items as the comma-separated body of a JSON array"""
+    return b",".join(orjson.dumps(item, default=json_default) for item in items)
+
+
+async def stream_json_list(
+    key: str,
+    items: List[Dict],
+    next_cursor: Optional[str] = None,
+    fetch_page: Optional[PageFetcher] = None
+) -> AsyncIterator[bytes]:
+    """Yield {"<key>": [...]} chunk by chunk, one DynamoDB page at a time"""
+    yield b'{"' + key.encode() + b'":['
+    started = bool(items)
+    if items:
+        yield _encode_page(items)
+    
+    while next_cursor and fetch_page is not None:
+        items, next_cursor = await fetch_page(next_cursor)
+        if items:
+            yield (b"," if started else b"") + _encode_page(items)
+            started = True
+    
+    yield b"]}"
@@ -86,13 +86,20 @@ def start_server(venv_path):
     print("=" * 50)
     
     try:
-        # Start uvicorn server
-        subprocess.run([
+        command = [
             python_path, "-m", "uvicorn", "main:app",
             "--host", "0.0.0.0",
-            "--port", "8001",
-            "--reload"
-        ], check=True)
+            "--port", "8001"
+        ]
+        # The reloader's file watcher only helps while developing
+        if os.getenv("ENVIRONMENT") != "production":
+            command.append("--reload")
+        # uvicorn[standard] installs uvloop and httptools everywhere but Windows
+        if platform.system() != "Windows":
+            command += ["--loop", "uvloop", "--http", "httptools"]
+        
+        # Start uvicorn server
+        subprocess.run(command, check=True)
     except KeyboardInterrupt:
         print("\n\n👋 Server stopped gracefully")
     except subprocess.CalledProcessError:
@@ -42,32 +42,54 @@ class ServiceManager:
         service = self.services[service_name]
         print(f"🚀 Starting {service['description']} on port {service['port']}...")
         
-        process = subprocess.Popen(
-            service["command"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
+        # Services write to this terminal; an unread pipe would fill up and
+        # block them once they log enough
+        process = subprocess.Popen(service["command"])
         
         self.processes.append(process)
         return process
     
+    async def wait_for_port(self, port: int, timeout: float = 15.0) -> bool:
+        """Poll a local port every 100 ms until it accepts connections or the timeout passes"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("localhost", port)
+                writer.close()
+                await writer.wait_closed()
+                return True
+            except OSError:
+                if loop.time() >= deadline:
+                    return False
+                await asyncio.sleep(0.1)
+    
+    async def wait_until_ready(self) -> List[str]:
+        """Wait for all service ports at once; returns the services that never came up"""
+        names = list(self.services)
+        ready = await asyncio.gather(*(self.wait_for_port(self.services[name]["port"]) for name in names))
+        return [name for name, is_ready in zip(names, ready) if not is_ready]
+    
     def start_all_services(self):
         """Start all backend services"""
         print("🏪 Starting Three-App Architecture Backend Services...")
         print("=" * 60)
         
+        # Launch everything first, then wait for all of them side by side
         for service_name in self.services.keys():
             try:
                 self.start_service(service_name)
-                time.sleep(1)  # Small delay between starts
             except Exception as e:
                 print(f"❌ Failed to start {service_name}: {e}")
                 self.shutdown()
                 sys.exit(1)
         
+        failed = asyncio.run(self.wait_until_ready())
+        if failed:
+            print(f"❌ Services did not come up: {', '.join(failed)}")
+            self.shutdown()
+            sys.exit(1)
+        
         print("=" * 60)
         print("✅ All services started successfully!")
         print("\n📊 Service URLs:")
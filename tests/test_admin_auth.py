@@ -0,0 +1,70 @@
+"""
+Admin authentication follows the stored user, not the token claims
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from admin_api.main import app
+from shared.auth.google_auth import google_auth_service
+from shared.database.dynamodb import db_service
+
+ADMIN = {
+    "user_id": "admin-1",
+    "email": "admin@example.com",
+    "name": "Admin",
+    "role": "admin",
+    "is_active": True
+}
+
+
+@pytest.fixture
+def stored_user(monkeypatch):
+    """Serve a single user record in place of DynamoDB"""
+    user = dict(ADMIN)
+
+    async def get_user(user_id):
+        return dict(user) if user_id == user["user_id"] else None
+
+    monkeypatch.setattr(db_service, "get_user", get_user)
+    return user
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def _auth_headers():
+    # The token is issued while the user is still an active admin
+    token = google_auth_service.create_jwt_token(ADMIN)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_active_admin_is_allowed(stored_user, client):
+    response = client.get("/users/admin-1", headers=_auth_headers())
+    assert response.status_code == 200
+
+
+def test_demoted_admin_is_rejected(stored_user, client):
+    headers = _auth_headers()
+    stored_user["role"] = "customer"
+    response = client.get("/users/admin-1", headers=headers)
+    assert response.status_code == 403
+
+
+def test_deactivated_admin_is_rejected(stored_user, client):
+    headers = _auth_headers()
+    stored_user["is_active"] = False
+    response = client.get("/users/admin-1", headers=headers)
+    assert response.status_code == 403
+
+
+def test_missing_user_is_not_found(stored_user, client):
+    token = google_auth_service.create_jwt_token({**ADMIN, "user_id": "gone"})
+    response = client.get("/users/gone", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
+
+
+def test_invalid_token_is_unauthorized(stored_user, client):
+    response = client.get("/users/admin-1", headers={"Authorization": "Bearer nonsense"})
+    assert response.status_code == 401